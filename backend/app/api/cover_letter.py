@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from app.models.schemas import (
     CoverLetterRequest,
     CoverLetterResponse,
@@ -8,22 +9,114 @@ from app.models.schemas import (
     ToneType,
     CoverLetterBatchResponse,
     ExportRequest,
+    BulkExportRequest,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse,
+    RankJobsRequest,
+    RankJobsResponse,
+    RankedJob,
+    AddCvRequest,
+    AddCvResponse,
+    RankCvsRequest,
+    RankCvsResponse,
+    RankedCv,
+    VariantError,
+    VariantMetadata,
 )
-from app.services.spacy_service import SpaCyService
+from app.services.nlp_factory import create_nlp_service, create_skill_comparer, engine_model_name, engine_ruleset_version
 from app.services.ollama_service import OllamaAiService
+from app.services.ai_service import GenerationResult
+from app.services.nlp_executor import AnalysisExecutor, AnalysisQueueFull
+from app.services.analysis import CvAnalysis, PostingAnalysis
+from app.services.language_detector import DEFAULT_LANGUAGE
+from app.services.letter_templates import TemplateRegistry, letter_values
+from app.services.llm_scheduler import SchedulerOverloaded, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from app.services.analysis_cache import AnalysisCache, normalize_text
+from app.services.cache import TieredCache, content_key
+from app.services.cv_index import CvIndex
+from app.services.export_cache import ExportCache, etag_matches, strong_etag
+from app.services.document_export import (
+    DocumentRenderer,
+    MEDIA_TYPES,
+    RENDER_VERSION,
+    ZipStream,
+    archive_entry_name,
+    content_disposition,
+    export_filename,
+)
+from app.services.model_loader import ModelLoader, Readiness
 from app.settings import settings
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
+import asyncio
+import heapq
 import io
-import tempfile
+import json
 import os
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
+import threading
 
 router = APIRouter()
-nlp_service = SpaCyService()
+# The NLP engine (NLP_ENGINE) loads in the background during startup (see main.lifespan), not at import,
+# and in this process only when NLP_WORKERS=0
+nlp_loader = ModelLoader(create_nlp_service)
+# Model-free matching and recommendations used after analysis, whichever process analysed
+skill_comparer = create_skill_comparer()
+readiness = Readiness()
+analysis_executor = AnalysisExecutor(
+    create_nlp_service,
+    workers=settings.NLP_WORKERS,
+    max_pending=settings.NLP_MAX_PENDING,
+    local_factory=nlp_loader.get,
+)
+analysis_cache = AnalysisCache(
+    TieredCache.from_settings(
+        settings.ANALYSIS_CACHE_MAX_BYTES,
+        settings.ANALYSIS_CACHE_TTL,
+        settings.ANALYSIS_CACHE_PATH,
+        settings.ANALYSIS_CACHE_DISK_MAX_BYTES,
+    ),
+    model_name=engine_model_name(),
+    ruleset_version=engine_ruleset_version,
+)
+# PDF/DOCX rendering; each worker process builds the ReportLab styles once
+export_executor = AnalysisExecutor(
+    DocumentRenderer,
+    workers=settings.EXPORT_WORKERS,
+    max_pending=settings.EXPORT_MAX_PENDING,
+    name="Export",
+)
+# Rendered exports by content hash (None when EXPORT_CACHE_ENABLED is off)
+export_cache: Optional[ExportCache] = None
+if settings.EXPORT_CACHE_ENABLED:
+    export_cache = ExportCache(
+        TieredCache.from_settings(
+            settings.EXPORT_CACHE_MAX_BYTES,
+            settings.EXPORT_CACHE_TTL,
+            settings.EXPORT_CACHE_PATH,
+            settings.EXPORT_CACHE_DISK_MAX_BYTES,
+        ),
+        render_version=RENDER_VERSION,
+    )
+# Template-provider letters; every template is read and checked once here
+template_registry = TemplateRegistry.from_directory(settings.LETTER_TEMPLATES_DIR)
+# Opened on first use so importing the router never creates the index file
+cv_index: Optional[CvIndex] = None
+_cv_index_lock = threading.Lock()
+
+
+def get_cv_index() -> CvIndex:
+    """The shared index; called from the thread pool, so opening it is guarded"""
+    global cv_index
+    with _cv_index_lock:
+        if cv_index is None:
+            cv_index = CvIndex(settings.CV_INDEX_PATH)
+    return cv_index
+
+
+def close_cv_index() -> None:
+    global cv_index
+    if cv_index is not None:
+        cv_index.close()
+        cv_index = None
 
 # Initialize AI service based on provider
 if settings.AI_PROVIDER == "ollama":
@@ -41,100 +134,82 @@ async def generate_cover_letter(request: CoverLetterRequest):
     Generate a personalized cover letter based on job posting and CV
     """
     try:
-        # Extract job information
-        job_info = nlp_service.extract_job_info(request.job_posting.job_posting_text)
-        
-        # Extract skills from job posting
-        job_skills = nlp_service.extract_skills_from_text(request.job_posting.job_posting_text)
-        key_requirements = nlp_service.extract_key_requirements(request.job_posting.job_posting_text)
-        
-        # Extract skills from CV
-        cv_skills = nlp_service.analyze_cv_skills(request.cv_data.cv_text or "")
-        
-        # Match skills
-        skill_matches = nlp_service.match_skills(job_skills, cv_skills)
-        
-        # Find missing skills
-        missing_skills = nlp_service.find_missing_skills(job_skills, cv_skills)
-        
-        # Generate recommendations
-        recommendations = nlp_service.generate_recommendations(skill_matches, missing_skills)
-        
-        # Use provided company name and position title if available
-        final_company_name = request.company_name or job_info.get('company_name', 'Tech Company')
-        final_position_title = request.position_title or job_info.get('position_title', 'Software Engineer')
-        
-        # Create analysis
-        analysis = JobAnalysis(
-            extracted_skills=job_skills,
-            required_experience=job_info.get('required_experience', '3+ years'),
-            company_name=final_company_name,
-            position_title=final_position_title,
-            key_requirements=key_requirements
-        )
+        result, analysis, enhanced_job_info, skill_match_objects = await _prepare_generation(request)
+        cv_skills = result.cv_skills
+        skill_matches = result.skill_matches
         
         # Single or multi-variant generation
         num_variants = max(1, int(request.variants or 1))
         tones_cycle = ['formal', 'friendly', 'concise']
+        tones = [request.tone.value] if num_variants == 1 else [
+            tones_cycle[i % len(tones_cycle)] for i in range(num_variants)
+        ]
+        # Single letters are scheduled ahead of multi-variant batches
+        priority = PRIORITY_INTERACTIVE if num_variants == 1 else PRIORITY_BATCH
+        outcomes, prefix = await _draft_variants(
+            tones, enhanced_job_info, cv_skills, skill_matches, priority,
+            seed=request.seed, reuse_cached=request.reuse_cached,
+        )
+        
         letters: List[str] = []
         tones_used: List[str] = []
-        for i in range(num_variants):
-            tone_to_use = request.tone
-            if num_variants > 1:
-                tone_to_use = tones_cycle[i % len(tones_cycle)]
-            # Create enhanced job info with user-provided details
-            enhanced_job_info = {
-                **job_info,
-                'company_name': final_company_name,
-                'position_title': final_position_title,
-                'years_of_experience': request.years_of_experience,
-                'key_achievements': request.key_achievements,
-                'job_posting_text': request.job_posting.job_posting_text,
-                'cv_text': request.cv_data.cv_text
-            }
-            
-            if settings.AI_PROVIDER in ["ollama", "transformers"] and ai_service:
-                letter = await ai_service.draft_cover_letter(
-                    job_info=enhanced_job_info,
-                    cv_skills=cv_skills,
-                    skill_matches=skill_matches,
-                    tone=tone_to_use,
-                )
+        cached_flags: List[bool] = []
+        errors: List[VariantError] = []
+        variant_metadata: List[VariantMetadata] = []
+        for i, (tone_to_use, outcome) in enumerate(zip(tones, outcomes)):
+            if isinstance(outcome, BaseException):
+                if num_variants == 1:
+                    raise outcome
+                errors.append(VariantError(index=i, tone=tone_to_use, error=_variant_error_message(outcome)))
             else:
-                letter = generate_template_cover_letter(enhanced_job_info, cv_skills, skill_matches, tone_to_use)
-            letters.append(letter)
-            tones_used.append(tone_to_use)
-        
-        # Convert skill matches to SkillMatch objects
-        skill_match_objects = [
-            SkillMatch(
-                skill=match['skill'],
-                matched=match['matched'],
-                confidence=match['confidence'],
-                cv_evidence=match['cv_evidence']
-            )
-            for match in skill_matches
-        ]
+                letters.append(outcome.text)
+                tones_used.append(tone_to_use)
+                cached_flags.append(outcome.cached)
+                variant_metadata.append(VariantMetadata(
+                    index=i,
+                    tone=tone_to_use,
+                    prefix_reused=prefix is not None and not outcome.cached,
+                    cached=outcome.cached,
+                    prompt_eval_count=outcome.prompt_eval_count,
+                    prompt_eval_ms=_ns_to_ms(outcome.prompt_eval_duration),
+                    eval_count=outcome.eval_count,
+                    eval_ms=_ns_to_ms(outcome.eval_duration),
+                ))
+        if not letters:
+            overloaded = next((o for o in outcomes if isinstance(o, SchedulerOverloaded)), None)
+            if overloaded:
+                raise overloaded
+            raise HTTPException(status_code=502, detail=f"All {num_variants} variants failed: {errors[0].error}")
         
         if num_variants == 1:
             return CoverLetterResponse(
                 cover_letter=letters[0],
                 analysis=analysis,
                 skill_matches=skill_match_objects,
-                missing_skills=missing_skills,
-                recommendations=recommendations,
+                missing_skills=result.missing_skills,
+                recommendations=result.recommendations,
                 tone_used=tones_used[0],
+                cached=cached_flags[0],
             )
         else:
             return CoverLetterBatchResponse(
                 letters=letters,
                 analysis=analysis,
                 skill_matches=skill_match_objects,
-                missing_skills=missing_skills,
-                recommendations=recommendations,
+                missing_skills=result.missing_skills,
+                recommendations=result.recommendations,
                 tone_used=tones_used,
+                errors=errors,
+                variant_metadata=variant_metadata,
+                prefix_prompt_eval_ms=_ns_to_ms(prefix.prompt_eval_duration) if prefix else None,
             )
         
+    except HTTPException:
+        raise
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SchedulerOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -142,247 +217,553 @@ async def generate_cover_letter(request: CoverLetterRequest):
         print(f"Traceback: {error_details}")
         raise HTTPException(status_code=500, detail=f"Error generating cover letter: {str(e)}")
 
-@router.post("/export-pdf")
-async def export_cover_letter_pdf(request: ExportRequest):
-    """Export cover letter as PDF"""
-    try:
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            # Create PDF document
-            doc = SimpleDocTemplate(tmp_file.name, pagesize=A4)
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=30,
-                alignment=1,  # Center alignment
-                encoding='utf-8'
-            )
-            
-            normal_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=11,
-                spaceAfter=12,
-                leading=14,
-                encoding='utf-8'
-            )
-            
-            # Build PDF content
-            story = []
-            
-            # Title
-            story.append(Paragraph(f"Cover Letter - {request.position_title}", title_style))
-            story.append(Spacer(1, 20))
-            
-            # Company info
-            story.append(Paragraph(f"<b>Company:</b> {request.company_name}", normal_style))
-            story.append(Paragraph(f"<b>Position:</b> {request.position_title}", normal_style))
-            story.append(Spacer(1, 20))
-            
-            # Cover letter content
-            paragraphs = request.cover_letter.split('\n\n')
-            for para in paragraphs:
-                if para.strip():
-                    story.append(Paragraph(para.strip(), normal_style))
-                    story.append(Spacer(1, 12))
-            
-            # Build PDF
-            doc.build(story)
-            
-            # Return the file
-            return FileResponse(
-                tmp_file.name,
-                media_type='application/pdf',
-                filename=f'cover_letter_{request.company_name.replace(" ", "_")}_{request.position_title.replace(" ", "_")}.pdf'
-            )
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
+@router.post("/generate-cover-letter/stream")
+async def generate_cover_letter_stream(request: CoverLetterRequest):
+    """
+    Stream a single cover letter as server-sent events.
 
-@router.post("/export-docx")
-async def export_cover_letter_docx(request: ExportRequest):
-    """Export cover letter as DOCX"""
+    Events: one ``analysis`` event, ``token`` events as the model writes,
+    then ``done`` with Ollama's eval statistics (or ``error``). ``seed`` and
+    ``reuse_cached`` work as for the plain endpoint; a cached letter arrives
+    as a single ``token`` event and ``done`` reports ``cached: true``.
+    """
     try:
-        from docx import Document
-        from docx.shared import Inches
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_file:
-            # Create document
-            doc = Document()
-            
-            # Title
-            title = doc.add_heading(f'Cover Letter - {request.position_title}', 0)
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # Company info
-            doc.add_paragraph(f'Company: {request.company_name}')
-            doc.add_paragraph(f'Position: {request.position_title}')
-            doc.add_paragraph('')  # Empty line
-            
-            # Cover letter content
-            paragraphs = request.cover_letter.split('\n\n')
-            for para in paragraphs:
-                if para.strip():
-                    doc.add_paragraph(para.strip())
-            
-            # Save document
-            doc.save(tmp_file.name)
-            
-            # Return the file
-            return FileResponse(
-                tmp_file.name,
-                media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                filename=f'cover_letter_{request.company_name.replace(" ", "_")}_{request.position_title.replace(" ", "_")}.docx'
-            )
-            
+        if ai_service:
+            # Turn the request away before the stream starts rather than mid-stream
+            ai_service.scheduler.ensure_capacity()
+        result, analysis, enhanced_job_info, skill_match_objects = await _prepare_generation(request)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SchedulerOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating DOCX: {str(e)}")
-
-@router.get("/test")
-async def test_endpoint():
-    """Test endpoint to verify API is working"""
-    return {"message": "Cover letter API is working!", "status": "success"}
-
-
-def generate_template_cover_letter(job_info: dict, cv_skills: List[str], skill_matches: List[dict], tone: str) -> str:
-    """Generate cover letter based on job info, CV skills, and tone"""
-    
-    position_title = job_info.get('position_title', 'Software Engineer')
-    company_name = job_info.get('company_name', 'Tech Company')
-    
-    # Get matched skills
-    matched_skills = [match['skill'] for match in skill_matches if match['matched']]
-    top_skills = matched_skills[:3] if matched_skills else ['software development']
-    
-    # Detect language from job posting and CV
-    job_text = job_info.get('job_posting_text', '')
-    cv_text = job_info.get('cv_text', '')
-    
-    # Enhanced language detection
-    turkish_words = ["ve", "ile", "için", "bu", "bir", "da", "de", "gibi", "olarak", "üzerinde", "yazılım", "geliştirici", "deneyim", "konularında", "uzmanım", "arıyoruz", "gerekli", "şart"]
-    english_words = ["the", "and", "with", "for", "this", "a", "an", "in", "on", "at", "software", "developer", "experience", "skills", "required", "looking", "need"]
-    
-    turkish_count = sum(1 for word in turkish_words if word in job_text.lower() or word in cv_text.lower())
-    english_count = sum(1 for word in english_words if word in job_text.lower() or word in cv_text.lower())
+        raise HTTPException(status_code=500, detail=f"Error generating cover letter: {str(e)}")
     
-    is_turkish = turkish_count > english_count
+    async def events():
+        yield _sse("analysis", {
+            "analysis": analysis.model_dump(),
+            "skill_matches": [match.model_dump() for match in skill_match_objects],
+            "missing_skills": result.missing_skills,
+            "recommendations": result.recommendations,
+        })
+        stats = {}
+        cached = False
+        try:
+            if settings.AI_PROVIDER in ["ollama", "transformers"] and ai_service:
+                async for chunk in ai_service.stream_cover_letter(
+                    job_info=enhanced_job_info,
+                    cv_skills=result.cv_skills,
+                    skill_matches=result.skill_matches,
+                    tone=request.tone.value,
+                    seed=request.seed,
+                    reuse_cached=request.reuse_cached,
+                ):
+                    if chunk.get("response"):
+                        yield _sse("token", {"text": chunk["response"]})
+                    if chunk.get("done"):
+                        stats = {key: chunk[key] for key in _EVAL_STATS if key in chunk}
+                        cached = chunk.get("cached", False)
+            else:
+                letter = generate_template_cover_letter(enhanced_job_info, result.cv_skills, result.skill_matches, request.tone.value)
+                yield _sse("token", {"text": letter})
+            yield _sse("done", {"tone_used": request.tone, "cached": cached, **stats})
+        except Exception as e:
+            yield _sse("error", {"detail": f"Error generating cover letter: {str(e)}"})
     
-    # Generate based on tone and language
-    if is_turkish:
-        if tone == "formal":
-            cover_letter = f"""
-Sayın İnsan Kaynakları Yöneticisi,
-
-{company_name} şirketindeki {position_title} pozisyonu için başvuruda bulunmaktan heyecan duyuyorum. Yazılım geliştirme alanındaki deneyimim ve {', '.join(top_skills)} konularındaki uzmanlığımla ekibinize değerli katkılar sağlayabileceğimi düşünüyorum.
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Ollama's final-chunk statistics forwarded in the stream's done event
+_EVAL_STATS = (
+    "total_duration",
+    "load_duration",
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+)
 
-Deneyimlerim şunları içerir:
-- {len(cv_skills)} teknik yetenek, {', '.join(top_skills)} dahil
-- Güçlü problem çözme ve analitik yetenekler
-- Modern geliştirme pratikleri deneyimi
-- İşbirlikçi takım ortamı deneyimi
 
-Yenilikçi projelerinize katkıda bulunma ve ekibinizle birlikte büyüme fırsatı için heyecan duyuyorum.
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-Saygılarımla,
-[Adınız]
-            """.strip()
-        
-        elif tone == "friendly":
-            cover_letter = f"""
-Merhaba!
 
-{company_name}'deki {position_title} fırsatı için gerçekten heyecanlıyım! {', '.join(top_skills)} alanındaki deneyimimin ekibiniz için mükemmel bir uyum olacağını düşünüyorum.
+@router.post("/analyze-batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(request: BatchAnalysisRequest):
+    """
+    Analyze many job postings in one nlp.pipe pass
+    """
+    if len(request.job_postings) > settings.NLP_BATCH_MAX_DOCUMENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.NLP_BATCH_MAX_DOCUMENTS} job postings per batch analysis",
+        )
+    texts = [posting.job_posting_text for posting in request.job_postings]
+    batch_size = request.batch_size or settings.NLP_BATCH_SIZE
+    n_process = min(request.n_process or settings.NLP_N_PROCESS, os.cpu_count() or 1)
+    try:
+        postings = await _analyze_postings(texts, batch_size, n_process)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error analyzing job postings: {str(e)}")
+    return BatchAnalysisResponse(analyses=[_job_analysis(posting) for posting in postings])
 
-Size sunabileceklerim:
-- {', '.join(top_skills)} konusunda sağlam deneyim
-- Yeni teknolojiler öğrenme tutkusu
-- Mükemmel takım çalışması ve iletişim becerileri
-- Kaliteli sonuçlar sunma geçmişi
 
-Ekibinizin başarısına nasıl katkıda bulunabileceğim hakkında konuşmayı çok isterim!
+@router.post("/rank-jobs", response_model=RankJobsResponse)
+async def rank_jobs(request: RankJobsRequest):
+    """
+    Rank job postings by how well one CV fits them; analysis only, no LLM calls
+    """
+    if len(request.job_postings) > settings.NLP_BATCH_MAX_DOCUMENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.NLP_BATCH_MAX_DOCUMENTS} job postings per ranking",
+        )
+    texts = [posting.job_posting_text for posting in request.job_postings]
+    batch_size = request.batch_size or settings.NLP_BATCH_SIZE
+    try:
+        cv, postings = await asyncio.gather(
+            _analyze_cv(request.cv_data.cv_text or ""),
+            _analyze_postings(texts, batch_size, 1),
+        )
+        ranked = await run_in_threadpool(_rank_postings, skill_comparer, postings, cv.skills, request.top_k)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error ranking job postings: {str(e)}")
+    return RankJobsResponse(cv_skills=cv.skills, total_postings=len(postings), results=ranked)
+
+
+def _rank_postings(comparer, postings: List[PostingAnalysis], cv_skills: List[str], top_k: int) -> List[RankedJob]:
+    """Score every posting with the service's skill matching and keep the best top_k"""
+    def scored():
+        for index, posting in enumerate(postings):
+            matches = comparer.match_skills(posting.skills, cv_skills)
+            matched = [m["skill"] for m in matches if m["matched"]]
+            ratio = len(matched) / len(matches) if matches else 0.0
+            # Ties go to the stronger matches, then to the earlier posting
+            confidence = sum(m["confidence"] for m in matches)
+            yield (ratio, confidence, -index), index, posting, matches, matched
+
+    # A heap of size top_k instead of sorting every posting
+    best = heapq.nlargest(top_k, scored(), key=lambda item: item[0])
+    return [
+        RankedJob(
+            index=index,
+            match_ratio=round(key[0], 4),
+            matched_skills=matched,
+            missing_skills=[m["skill"] for m in matches if not m["matched"]],
+            analysis=_job_analysis(posting),
+        )
+        for key, index, posting, matches, matched in best
+    ]
 
-Saygılarımla,
-[Adınız]
-            """.strip()
-        
-        else:  # concise
-            cover_letter = f"""
-Sayın İnsan Kaynakları Yöneticisi,
 
-{company_name}'deki {position_title} pozisyonu ile ilgileniyorum.
+@router.post("/cvs", response_model=AddCvResponse)
+async def add_cv(request: AddCvRequest):
+    """
+    Analyse a CV and add (or replace) it in the recruiter-mode skill index
+    """
+    text = request.cv_data.cv_text or ""
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="cv_text is required")
+    cv_id = request.cv_id or content_key("cv", normalize_text(text))[:16]
+    try:
+        cv = await _analyze_cv(text)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    # The index is SQLite on disk, so its calls (and opening it) run on the thread pool
+    skills, indexed = await run_in_threadpool(_add_cv, cv_id, cv, request.name)
+    return AddCvResponse(cv_id=cv_id, skills=skills, indexed_cvs=indexed)
 
-Temel nitelikler:
-- {len(cv_skills)} teknik yetenek
-- {', '.join(top_skills)} deneyimi
-- Güçlü geliştirme geçmişi
 
-Hemen başlayabilirim.
+def _add_cv(cv_id: str, cv: CvAnalysis, name: Optional[str]) -> Tuple[List[str], int]:
+    index = get_cv_index()
+    # Stamped with the version the skills were really extracted with, not this process's view
+    skills = index.add(cv_id, cv.skills, cv.ruleset_version or engine_ruleset_version(), name=name)
+    return skills, len(index)
 
-Saygılarımla,
-[Adınız]
-            """.strip()
-    else:
-        # English templates (original)
-        if tone == "formal":
-            cover_letter = f"""
-Dear Hiring Manager,
 
-I am writing to express my strong interest in the {position_title} position at {company_name}. With my background in software development and experience with {', '.join(top_skills)}, I believe I would be a valuable addition to your team.
+@router.delete("/cvs/{cv_id}")
+async def remove_cv(cv_id: str):
+    """Remove a CV from the skill index"""
+    if not await run_in_threadpool(lambda: get_cv_index().remove(cv_id)):
+        raise HTTPException(status_code=404, detail=f"CV {cv_id} not found")
+    return {"cv_id": cv_id, "removed": True}
 
-My experience includes:
-- {len(cv_skills)} technical skills including {', '.join(top_skills)}
-- Strong problem-solving and analytical abilities
-- Experience with modern development practices
-- Collaborative team environment experience
 
-I am excited about the opportunity to contribute to your innovative projects and grow with your team.
+@router.post("/rank-cvs", response_model=RankCvsResponse)
+async def rank_cvs(request: RankCvsRequest):
+    """
+    Rank stored CVs against one posting; only CVs sharing a posting skill are scored
+    """
+    try:
+        posting = await _analyze_posting(request.job_posting.job_posting_text)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    # Stale means "extracted with other rules than this posting was"
+    current_version = posting.ruleset_version or engine_ruleset_version()
+    return await run_in_threadpool(_rank_cvs, skill_comparer, posting.skills, request.top_k, current_version)
+
+
+def _rank_cvs(comparer, posting_skills: List[str], top_k: int, ruleset_version: str) -> RankCvsResponse:
+    """Shortlist CVs through the index, score them with the skill matching and keep the best top_k"""
+    index = get_cv_index()
+    shortlist = index.candidates(posting_skills)
+    stored = index.get(list(shortlist))
+
+    def scored():
+        for cv_id, cv in stored.items():
+            matches = comparer.match_skills(posting_skills, cv["skills"])
+            matched = [m["skill"] for m in matches if m["matched"]]
+            ratio = len(matched) / len(matches) if matches else 0.0
+            confidence = sum(m["confidence"] for m in matches)
+            yield (ratio, confidence, cv_id), cv, matches, matched
+
+    best = heapq.nlargest(top_k, scored(), key=lambda item: item[0])
+    results = [
+        RankedCv(
+            cv_id=key[2],
+            name=cv["name"],
+            match_ratio=round(key[0], 4),
+            matched_skills=matched,
+            missing_skills=[m["skill"] for m in matches if not m["matched"]],
+            stale=cv["ruleset_version"] != ruleset_version,
+        )
+        for key, cv, matches, matched in best
+    ]
+    return RankCvsResponse(
+        posting_skills=posting_skills,
+        indexed_cvs=len(index),
+        candidates=len(shortlist),
+        stale_candidates=sum(cv["ruleset_version"] != ruleset_version for cv in stored.values()),
+        results=results,
+    )
+
+
+async def _prepare_generation(request: CoverLetterRequest):
+    """Analysis shared by the plain and streaming generate endpoints"""
+    # Posting and CV analyses come from the cache or one parse each, in parallel
+    posting, cv = await asyncio.gather(
+        _analyze_posting(request.job_posting.job_posting_text),
+        _analyze_cv(request.cv_data.cv_text or ""),
+    )
+    result = skill_comparer.compare_skills(posting, cv.skills)
+    job_info = posting.job_info
+    
+    # Use provided company name and position title if available
+    final_company_name = request.company_name or job_info.get('company_name', 'Tech Company')
+    final_position_title = request.position_title or job_info.get('position_title', 'Software Engineer')
+    analysis = _job_analysis(posting, final_company_name, final_position_title)
+    
+    # Create enhanced job info with user-provided details
+    enhanced_job_info = {
+        **job_info,
+        'company_name': final_company_name,
+        'position_title': final_position_title,
+        'years_of_experience': request.years_of_experience,
+        'key_achievements': request.key_achievements,
+        'job_posting_text': request.job_posting.job_posting_text,
+        'cv_text': request.cv_data.cv_text,
+        'language': posting.language,
+    }
+    
+    # Convert skill matches to SkillMatch objects
+    skill_match_objects = [
+        SkillMatch(
+            skill=match['skill'],
+            matched=match['matched'],
+            confidence=match['confidence'],
+            cv_evidence=match['cv_evidence']
+        )
+        for match in result.skill_matches
+    ]
+    return result, analysis, enhanced_job_info, skill_match_objects
+
+
+async def _draft_variants(
+    tones: List[str],
+    job_info: dict,
+    cv_skills: List[str],
+    skill_matches: List[dict],
+    priority: int = PRIORITY_INTERACTIVE,
+    seed: Optional[int] = None,
+    reuse_cached: bool = False,
+) -> Tuple[list, Optional[GenerationResult]]:
+    """Draft one letter per tone concurrently; failures come back as exceptions.
+
+    With OLLAMA_PREFIX_REUSE the shared prompt prefix is evaluated once and
+    each variant continues from its context. Returns the outcomes and the
+    priming result (None when the prefix was not shared).
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.VARIANT_CONCURRENCY))
+    timeout = settings.VARIANT_TIMEOUT or None
+    use_ollama = settings.AI_PROVIDER in ["ollama", "transformers"] and ai_service
+    
+    # Cache hits need no generation, so they must not trigger prefix priming either
+    cached = {}
+    if use_ollama and reuse_cached:
+        hits = await asyncio.gather(
+            *(ai_service.cached_cover_letter(job_info, skill_matches, tone, seed=seed) for tone in tones)
+        )
+        cached = {tone: hit for tone, hit in zip(tones, hits) if hit is not None}
+    
+    prefix = None
+    uncached = [tone for tone in tones if tone not in cached]
+    if use_ollama and settings.OLLAMA_PREFIX_REUSE and len(uncached) > 1:
+        try:
+            prefix = await asyncio.wait_for(
+                ai_service.prime_cover_letter_prefix(job_info, skill_matches, priority=priority), timeout
+            )
+        except SchedulerOverloaded:
+            raise
+        except Exception as e:
+            # Fall back to sending the full prompt for every variant
+            print(f"Prefix priming failed, generating variants without it: {str(e)}")
+    prefix_context = prefix.context if prefix else None
+
+    async def draft(tone: str) -> GenerationResult:
+        if tone in cached:
+            return cached[tone]
+        async with semaphore:
+            if use_ollama:
+                return await asyncio.wait_for(
+                    ai_service.draft_cover_letter_result(
+                        job_info=job_info,
+                        cv_skills=cv_skills,
+                        skill_matches=skill_matches,
+                        tone=tone,
+                        priority=priority,
+                        prefix_context=prefix_context,
+                        seed=seed,
+                    ),
+                    timeout,
+                )
+            return GenerationResult(text=generate_template_cover_letter(job_info, cv_skills, skill_matches, tone))
+
+    outcomes = await asyncio.gather(*(draft(tone) for tone in tones), return_exceptions=True)
+    return outcomes, prefix if prefix_context else None
+
+
+def _ns_to_ms(nanoseconds: Optional[int]) -> Optional[float]:
+    return round(nanoseconds / 1e6, 2) if nanoseconds is not None else None
+
+
+def _variant_error_message(error: BaseException) -> str:
+    if isinstance(error, asyncio.TimeoutError):
+        return f"Timed out after {settings.VARIANT_TIMEOUT:g}s"
+    return str(error) or type(error).__name__
+
+
+async def _analyze_posting(text: str) -> PostingAnalysis:
+    posting = await analysis_cache.get_posting(text)
+    if posting is None:
+        posting = await analysis_executor.run("analyze_posting", text)
+        await analysis_cache.set_posting(text, posting)
+    return posting
+
+
+async def _analyze_cv(text: str) -> CvAnalysis:
+    cv = await analysis_cache.get_cv(text)
+    if cv is None:
+        cv = await analysis_executor.run("analyze_cv", text)
+        await analysis_cache.set_cv(text, cv)
+    return cv
+
+
+async def _analyze_postings(texts: List[str], batch_size: int, n_process: int) -> List[PostingAnalysis]:
+    """Cached postings are reused; only the misses go through nlp.pipe"""
+    postings = list(await asyncio.gather(*(analysis_cache.get_posting(text) for text in texts)))
+    missing = [i for i, posting in enumerate(postings) if posting is None]
+    if missing:
+        missing_texts = [texts[i] for i in missing]
+        if n_process > 1 and analysis_executor.workers == 0:
+            # nlp.pipe starts its own processes, which pool workers (daemons) cannot do
+            nlp_service = await nlp_loader.load()
+            fresh = await run_in_threadpool(nlp_service.analyze_postings, missing_texts, batch_size, n_process)
+        elif n_process > 1:
+            # With worker processes the model stays out of this process: split the batch across them
+            parts = min(n_process, analysis_executor.workers, len(missing_texts))
+            chunks = [missing_texts[i::parts] for i in range(parts)]
+            results = await asyncio.gather(
+                *(analysis_executor.run("analyze_postings", chunk, batch_size, 1) for chunk in chunks)
+            )
+            fresh = [None] * len(missing_texts)
+            for i, chunk_result in enumerate(results):
+                fresh[i::parts] = chunk_result
+        else:
+            fresh = await analysis_executor.run("analyze_postings", missing_texts, batch_size, 1)
+        for i, posting in zip(missing, fresh):
+            postings[i] = posting
+        await asyncio.gather(*(analysis_cache.set_posting(texts[i], postings[i]) for i in missing))
+    return postings
+
+
+def _job_analysis(posting: PostingAnalysis, company_name: str = None, position_title: str = None) -> JobAnalysis:
+    """Build the API analysis model, preferring user-provided company and title"""
+    job_info = posting.job_info
+    return JobAnalysis(
+        extracted_skills=posting.skills,
+        required_experience=job_info.get('required_experience', '3+ years'),
+        company_name=company_name or job_info.get('company_name', 'Tech Company'),
+        position_title=position_title or job_info.get('position_title', 'Software Engineer'),
+        key_requirements=posting.key_requirements,
+        language=posting.language,
+    )
 
-Best regards,
-[Your Name]
-            """.strip()
-        
-        elif tone == "friendly":
-            cover_letter = f"""
-Hi there!
+@router.post("/export-pdf")
+async def export_cover_letter_pdf(request: ExportRequest, if_none_match: Optional[str] = Header(None)):
+    """Export cover letter as PDF"""
+    return await _export(request, "pdf", "PDF", if_none_match)
 
-I'm really excited about the {position_title} opportunity at {company_name}! I think my background in {', '.join(top_skills)} would be a great fit for your team.
+@router.post("/export-docx")
+async def export_cover_letter_docx(request: ExportRequest, if_none_match: Optional[str] = Header(None)):
+    """Export cover letter as DOCX"""
+    return await _export(request, "docx", "DOCX", if_none_match)
 
-Here's what I bring to the table:
-- Solid experience with {', '.join(top_skills)}
-- A passion for learning new technologies
-- Great teamwork and communication skills
-- A track record of delivering quality results
 
-I'd love to chat about how I can contribute to your team's success!
+async def _export(request: ExportRequest, fmt: str, label: str, if_none_match: Optional[str] = None) -> Response:
+    """Serve a cached or freshly rendered document; 304 when the client already has these bytes"""
+    try:
+        content = await _render_export(fmt, request)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating {label}: {str(e)}")
+    etag = strong_etag(content)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    filename = export_filename(request.company_name, request.position_title, fmt)
+    return Response(
+        content=content,
+        media_type=MEDIA_TYPES[fmt],
+        headers={**content_disposition(filename), "ETag": etag},
+    )
+
+
+async def _render_export(fmt: str, document: ExportRequest) -> bytes:
+    """Render in the export pool straight into memory, or take the bytes from the export cache"""
+    fields = (fmt, document.cover_letter, document.position_title, document.company_name)
+    if export_cache:
+        cached = await export_cache.get(*fields)
+        if cached is not None:
+            return cached
+    content = await export_executor.run("render", *fields)
+    if export_cache:
+        await export_cache.set(*fields, content)
+    return content
+
+@router.post("/export-bulk")
+async def export_bulk(request: BulkExportRequest):
+    """
+    Export many cover letters as one ZIP archive.
 
-Best,
-[Your Name]
-            """.strip()
-        
-        else:  # concise
-            cover_letter = f"""
-Dear Hiring Manager,
+    Documents render in parallel in the export pool and each one is streamed
+    as an archive entry as soon as it is ready, so entries arrive in
+    completion order and the archive is never held in memory. Documents that
+    fail to render are listed in an errors.txt entry instead.
+    """
+    if len(request.documents) > settings.EXPORT_BULK_MAX_DOCUMENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.EXPORT_BULK_MAX_DOCUMENTS} documents per bulk export",
+        )
+    if export_executor.pending >= export_executor.capacity:
+        raise HTTPException(status_code=503, detail="Export queue is full", headers={"Retry-After": "1"})
+    fmt = request.format.value
+    return StreamingResponse(
+        _bulk_export_chunks(request.documents, fmt),
+        media_type="application/zip",
+        headers=content_disposition(f"cover_letters_{fmt}.zip"),
+    )
+
+
+async def _bulk_export_chunks(documents: List[ExportRequest], fmt: str):
+    # A slot is taken before a document renders and given back only once its entry has been
+    # sent, so a slow client holds at most EXPORT_BULK_CONCURRENCY rendered documents
+    semaphore = asyncio.Semaphore(max(1, settings.EXPORT_BULK_CONCURRENCY))
+
+    async def render(index: int, document: ExportRequest):
+        await semaphore.acquire()
+        try:
+            return index, await _render_export(fmt, document), None
+        except Exception as e:
+            return index, None, e
 
-I'm interested in the {position_title} position at {company_name}.
+    tasks = [asyncio.create_task(render(index, document)) for index, document in enumerate(documents)]
+    archive = ZipStream()
+    errors = []
+    try:
+        for finished in asyncio.as_completed(tasks):
+            index, content, error = await finished
+            document = documents[index]
+            name = archive_entry_name(index, document.company_name, document.position_title, fmt)
+            if error is not None:
+                print(f"❌ Bulk export of {name} failed: {error}")
+                errors.append(f"{name}: {error}")
+                semaphore.release()
+                continue
+            chunk = archive.add(name, content)
+            content = None
+            yield chunk
+            chunk = None
+            semaphore.release()
+        if errors:
+            yield archive.add("errors.txt", ("\n".join(errors) + "\n").encode("utf-8"))
+        yield archive.close()
+    finally:
+        # The client may disconnect mid-archive; stop rendering what nobody will receive
+        for task in tasks:
+            task.cancel()
+
+async def warm_up() -> None:
+    """Load the NLP engine and start its and the export workers, then mark the API ready"""
+    readiness.begin()
+    try:
+        # The API process only loads the model when it runs the analyses itself (NLP_WORKERS=0);
+        # otherwise the workers own it and comparison here uses the model-free skill_comparer
+        loads = [analysis_executor.start(), export_executor.start()]
+        if analysis_executor.workers == 0:
+            loads.append(nlp_loader.load())
+        await asyncio.gather(*loads)
+    except Exception as e:
+        print(f"❌ NLP warm-up failed: {e}")
+        readiness.mark_failed(e)
+        return
+    readiness.mark_ready()
+    print(f"✅ NLP ready in {readiness.time_to_ready:.2f}s")
+
+
+@router.get("/metrics")
+async def metrics():
+    """Cache and worker-pool counters"""
+    return {
+        "startup": {**readiness.stats(), "nlp_engine": {"name": settings.NLP_ENGINE, **nlp_loader.stats()}},
+        "analysis_cache": analysis_cache.stats(),
+        "analysis_executor": analysis_executor.stats(),
+        "export_executor": export_executor.stats(),
+        "export_cache": export_cache.stats() if export_cache else None,
+        "ollama_pool": ai_service.pool_stats() if ai_service else None,
+        "llm_scheduler": ai_service.scheduler.stats() if ai_service else None,
+        "cv_index": await run_in_threadpool(cv_index.stats, engine_ruleset_version()) if cv_index is not None else None,
+        "llm_response_cache": ai_service.response_cache.stats() if ai_service and ai_service.response_cache else None,
+    }
 
-Key qualifications:
-- {len(cv_skills)} technical skills
-- Experience with {', '.join(top_skills)}
-- Strong development background
+@router.get("/test")
+async def test_endpoint():
+    """Test endpoint to verify API is working"""
+    return {"message": "Cover letter API is working!", "status": "success"}
 
-Available for immediate start.
 
-Best regards,
-[Your Name]
-            """.strip()
-    
-    return cover_letter
+def generate_template_cover_letter(job_info: dict, cv_skills: List[str], skill_matches: List[dict], tone: str) -> str:
+    """Generate cover letter from the template for the posting's language and the tone"""
+    language = job_info.get('language', DEFAULT_LANGUAGE)
+    return template_registry.render(language, tone, letter_values(job_info, cv_skills, skill_matches))
 
 
 @router.post("/extract-cv-text")
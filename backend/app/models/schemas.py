@@ -24,12 +24,22 @@ class CoverLetterRequest(BaseModel):
     tone: ToneType = Field(..., description="Writing tone for the cover letter")
     custom_instructions: Optional[str] = Field(None, description="Custom instructions for generation")
     variants: Optional[int] = Field(1, ge=1, description="Number of cover letter variants to generate")
+    seed: Optional[int] = Field(None, description="Sampling seed; fixes the output for identical inputs")
+    reuse_cached: bool = Field(False, description="Return a previously generated letter for identical inputs if cached")
 
 class ExportRequest(BaseModel):
     cover_letter: str = Field(..., description="Cover letter text content")
     position_title: str = Field("Position", description="Position title")
     company_name: str = Field("Company", description="Company name")
 
+class ExportFormat(str, Enum):
+    PDF = "pdf"
+    DOCX = "docx"
+
+class BulkExportRequest(BaseModel):
+    documents: List[ExportRequest] = Field(..., min_length=1, description="Cover letters to export, one archive entry each")
+    format: ExportFormat = Field(ExportFormat.PDF, description="Document format of every entry")
+
 class SkillMatch(BaseModel):
     skill: str
     matched: bool
@@ -42,6 +52,62 @@ class JobAnalysis(BaseModel):
     company_name: Optional[str] = None
     position_title: Optional[str] = None
     key_requirements: List[str] = []
+    language: str = "en"
+
+class BatchAnalysisRequest(BaseModel):
+    job_postings: List[JobPostingRequest] = Field(..., description="Job postings to analyze")
+    batch_size: Optional[int] = Field(None, ge=1, description="Documents per nlp.pipe batch")
+    n_process: Optional[int] = Field(None, ge=1, description="Processes used by nlp.pipe")
+
+class BatchAnalysisResponse(BaseModel):
+    analyses: List[JobAnalysis]
+
+class RankJobsRequest(BaseModel):
+    cv_data: CVRequest
+    job_postings: List[JobPostingRequest] = Field(..., description="Job postings to rank against the CV")
+    top_k: int = Field(10, ge=1, description="Number of best-fitting postings to return")
+    batch_size: Optional[int] = Field(None, ge=1, description="Documents per nlp.pipe batch for uncached postings")
+
+class RankedJob(BaseModel):
+    index: int = Field(..., description="Position of the posting in the request")
+    match_ratio: float = Field(..., description="Share of the posting's skills found in the CV")
+    matched_skills: List[str]
+    missing_skills: List[str]
+    analysis: JobAnalysis
+
+class RankJobsResponse(BaseModel):
+    cv_skills: List[str]
+    total_postings: int
+    results: List[RankedJob]
+
+class AddCvRequest(BaseModel):
+    cv_data: CVRequest
+    cv_id: Optional[str] = Field(None, description="Stable id; defaults to a hash of the CV text")
+    name: Optional[str] = Field(None, description="Candidate name shown in rankings")
+
+class AddCvResponse(BaseModel):
+    cv_id: str
+    skills: List[str]
+    indexed_cvs: int
+
+class RankCvsRequest(BaseModel):
+    job_posting: JobPostingRequest
+    top_k: int = Field(10, ge=1, description="Number of best-fitting CVs to return")
+
+class RankedCv(BaseModel):
+    cv_id: str
+    name: Optional[str] = None
+    match_ratio: float = Field(..., description="Share of the posting's skills found in the CV")
+    matched_skills: List[str]
+    missing_skills: List[str]
+    stale: bool = Field(False, description="Skills were extracted with an older rule set; add the CV again to refresh them")
+
+class RankCvsResponse(BaseModel):
+    posting_skills: List[str]
+    indexed_cvs: int
+    candidates: int = Field(..., description="CVs sharing at least one posting skill, i.e. the ones scored")
+    stale_candidates: int = Field(0, description="Scored CVs whose skills came from an older rule set")
+    results: List[RankedCv]
 
 class CoverLetterResponse(BaseModel):
     cover_letter: str
@@ -50,6 +116,22 @@ class CoverLetterResponse(BaseModel):
     missing_skills: List[str]
     recommendations: List[str]
     tone_used: ToneType
+    cached: bool = False
+
+class VariantError(BaseModel):
+    index: int
+    tone: ToneType
+    error: str
+
+class VariantMetadata(BaseModel):
+    index: int
+    tone: ToneType
+    prefix_reused: bool = False
+    cached: bool = False
+    prompt_eval_count: Optional[int] = None
+    prompt_eval_ms: Optional[float] = None
+    eval_count: Optional[int] = None
+    eval_ms: Optional[float] = None
 
 class CoverLetterBatchResponse(BaseModel):
     letters: List[str]
@@ -58,6 +140,9 @@ class CoverLetterBatchResponse(BaseModel):
     missing_skills: List[str]
     recommendations: List[str]
     tone_used: Union[ToneType, List[ToneType]]
+    errors: List[VariantError] = []
+    variant_metadata: List[VariantMetadata] = []
+    prefix_prompt_eval_ms: Optional[float] = None
 
 class HealthResponse(BaseModel):
     """Health check response"""
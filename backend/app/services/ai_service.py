@@ -1,6 +1,33 @@
 from __future__ import annotations
 
-from typing import Protocol, List, Dict
+from dataclasses import dataclass, field
+from typing import Protocol, List, Dict, Optional
+
+
+@dataclass
+class GenerationResult:
+    """Generated text plus the model's eval statistics (durations in nanoseconds)"""
+
+    text: str
+    prompt_eval_count: Optional[int] = None
+    prompt_eval_duration: Optional[int] = None
+    eval_count: Optional[int] = None
+    eval_duration: Optional[int] = None
+    total_duration: Optional[int] = None
+    cached: bool = False
+    context: List[int] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def from_ollama(cls, data: Dict) -> "GenerationResult":
+        return cls(
+            text=data.get("response", ""),
+            prompt_eval_count=data.get("prompt_eval_count"),
+            prompt_eval_duration=data.get("prompt_eval_duration"),
+            eval_count=data.get("eval_count"),
+            eval_duration=data.get("eval_duration"),
+            total_duration=data.get("total_duration"),
+            context=data.get("context") or [],
+        )
 
 
 class AiService(Protocol):
@@ -0,0 +1,40 @@
+"""
+Plain-data results of the NLP analysis stage
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict
+
+from .language_detector import DEFAULT_LANGUAGE
+
+
+@dataclass
+class PostingAnalysis:
+    """Everything the extractors produce for one job posting"""
+
+    job_info: Dict[str, str] = field(default_factory=dict)
+    skills: List[str] = field(default_factory=list)
+    key_requirements: List[str] = field(default_factory=list)
+    # ISO 639-1 code of the posting, detected once and reused by every letter generator
+    language: str = DEFAULT_LANGUAGE
+    # Rule-set version the analysing process actually used ("" if its rules changed mid-analysis)
+    ruleset_version: str = ""
+
+
+@dataclass
+class CvAnalysis:
+    """CV skills with the rule-set version they were extracted with"""
+
+    skills: List[str] = field(default_factory=list)
+    ruleset_version: str = ""
+
+
+@dataclass
+class ApplicationAnalysis:
+    """Posting and CV analysis plus the skill comparison between them"""
+
+    posting: PostingAnalysis
+    cv_skills: List[str]
+    skill_matches: List[Dict]
+    missing_skills: List[str]
+    recommendations: List[str]
@@ -0,0 +1,64 @@
+"""
+Content-addressed cache for posting and CV analysis results
+"""
+
+import json
+from dataclasses import asdict
+from typing import Callable, List, Optional
+
+from .analysis import CvAnalysis, PostingAnalysis
+from .cache import TieredCache, content_key
+
+
+def normalize_text(text: str) -> str:
+    """Normalise line endings and surrounding whitespace before hashing"""
+    return "\n".join(line.rstrip() for line in (text or "").strip().splitlines())
+
+
+class AnalysisCache:
+    """Stores extractor output keyed by text hash, model name and rule-set version.
+
+    A new model or rule set changes every key, so stale analyses are never
+    served after an upgrade; they simply age out of the LRU. Lookups use the
+    rule-set version this process currently sees (rule files reload at
+    runtime), but results are stored under the version the analysing worker
+    reports, since its loader reloads on its own clock; results without one
+    are not stored. Lookups are coroutines so the optional SQLite tier never
+    blocks the loop.
+    """
+
+    def __init__(self, cache: TieredCache, model_name: str, ruleset_version: Callable[[], str]):
+        self.cache = cache
+        self.model_name = model_name
+        self.ruleset_version = ruleset_version
+
+    def key(self, kind: str, text: str, ruleset_version: str) -> str:
+        return content_key(kind, self.model_name, ruleset_version, normalize_text(text))
+
+    async def get_posting(self, text: str) -> Optional[PostingAnalysis]:
+        raw = await self.cache.get_async(self.key("posting", text, self.ruleset_version()))
+        if raw is None:
+            return None
+        return PostingAnalysis(**json.loads(raw))
+
+    async def set_posting(self, text: str, posting: PostingAnalysis) -> None:
+        if posting.ruleset_version:
+            key = self.key("posting", text, posting.ruleset_version)
+            await self.cache.set_async(key, json.dumps(asdict(posting)).encode("utf-8"))
+
+    async def get_cv(self, text: str) -> Optional[CvAnalysis]:
+        version = self.ruleset_version()
+        raw = await self.cache.get_async(self.key("cv", text, version))
+        if raw is None:
+            return None
+        return CvAnalysis(skills=json.loads(raw), ruleset_version=version)
+
+    async def set_cv(self, text: str, cv: CvAnalysis) -> None:
+        if cv.ruleset_version:
+            await self.cache.set_async(self.key("cv", text, cv.ruleset_version), json.dumps(cv.skills).encode("utf-8"))
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "model_name": self.model_name, "ruleset_version": self.ruleset_version()}
+
+    def close(self) -> None:
+        self.cache.close()
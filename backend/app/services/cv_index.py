@@ -0,0 +1,121 @@
+"""
+Persisted inverted index from canonical skill to the stored CVs that list it
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+def canonical_skill(skill: str) -> str:
+    """Index key for a skill: lower-cased with single spaces"""
+    return " ".join(skill.lower().split())
+
+
+class CvIndex:
+    """SQLite-backed CV store with a skill -> CV id posting table.
+
+    Adding a CV replaces its previous postings, so the index is updated
+    incrementally as CVs arrive. Queries only touch the postings of the
+    requested skills and never scan the whole corpus. Each CV records the
+    rule-set version its skills were extracted with; rows from another
+    version are reported as stale until the CV is added again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cvs ("
+            "id TEXT PRIMARY KEY, name TEXT, skills TEXT NOT NULL, "
+            "ruleset_version TEXT NOT NULL, added_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS skill_postings ("
+            "skill TEXT NOT NULL, cv_id TEXT NOT NULL, PRIMARY KEY (skill, cv_id)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS skill_postings_cv ON skill_postings (cv_id)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def add(self, cv_id: str, skills: Iterable[str], ruleset_version: str, name: Optional[str] = None) -> List[str]:
+        """Store (or replace) a CV and its postings; returns the canonical skills indexed"""
+        canonical = list(dict.fromkeys(canonical_skill(s) for s in skills if s and s.strip()))
+        with self._lock:
+            self._conn.execute("DELETE FROM skill_postings WHERE cv_id = ?", (cv_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cvs (id, name, skills, ruleset_version, added_at) VALUES (?, ?, ?, ?, ?)",
+                (cv_id, name, json.dumps(canonical), ruleset_version, time.time()),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO skill_postings (skill, cv_id) VALUES (?, ?)",
+                [(skill, cv_id) for skill in canonical],
+            )
+            self._conn.commit()
+        return canonical
+
+    def remove(self, cv_id: str) -> bool:
+        with self._lock:
+            self._conn.execute("DELETE FROM skill_postings WHERE cv_id = ?", (cv_id,))
+            deleted = self._conn.execute("DELETE FROM cvs WHERE id = ?", (cv_id,)).rowcount
+            self._conn.commit()
+        return deleted > 0
+
+    def candidates(self, skills: Iterable[str]) -> Dict[str, List[str]]:
+        """CV ids sharing at least one of ``skills``, with the shared canonical skills"""
+        wanted = list(dict.fromkeys(canonical_skill(s) for s in skills if s and s.strip()))
+        if not wanted:
+            return {}
+        placeholders = ",".join("?" * len(wanted))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT cv_id, skill FROM skill_postings WHERE skill IN ({placeholders})", wanted
+            ).fetchall()
+        shared: Dict[str, List[str]] = {}
+        for cv_id, skill in rows:
+            shared.setdefault(cv_id, []).append(skill)
+        return shared
+
+    def get(self, cv_ids: Iterable[str]) -> Dict[str, dict]:
+        """Stored name and skills for each of ``cv_ids`` that exists"""
+        ids = list(cv_ids)
+        found: Dict[str, dict] = {}
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, name, skills, ruleset_version FROM cvs WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+            for cv_id, name, skills, version in rows:
+                found[cv_id] = {"name": name, "skills": json.loads(skills), "ruleset_version": version}
+        return found
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cvs").fetchone()[0]
+
+    def stats(self, ruleset_version: Optional[str] = None) -> Dict[str, int]:
+        with self._lock:
+            cvs = self._conn.execute("SELECT COUNT(*) FROM cvs").fetchone()[0]
+            skills, postings = self._conn.execute(
+                "SELECT COUNT(DISTINCT skill), COUNT(*) FROM skill_postings"
+            ).fetchone()
+            stats = {"cvs": cvs, "skills": skills, "postings": postings}
+            if ruleset_version is not None:
+                stats["stale"] = self._conn.execute(
+                    "SELECT COUNT(*) FROM cvs WHERE ruleset_version != ?", (ruleset_version,)
+                ).fetchone()[0]
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
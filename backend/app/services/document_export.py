@@ -0,0 +1,165 @@
+"""
+PDF and DOCX rendering of cover letters into in-memory buffers
+"""
+
+import io
+import time
+import zipfile
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from urllib.parse import quote
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+# Bump whenever the rendered layout changes so cached exports are not reused
+RENDER_VERSION = "1"
+
+MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+@lru_cache(maxsize=1)
+def _pdf_styles() -> Tuple[ParagraphStyle, ParagraphStyle]:
+    """Title and body styles, built once per process"""
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=30,
+        alignment=1,  # Center alignment
+        encoding='utf-8'
+    )
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=12,
+        leading=14,
+        encoding='utf-8'
+    )
+    return title_style, normal_style
+
+
+def _paragraphs(cover_letter: str):
+    return [para.strip() for para in cover_letter.split('\n\n') if para.strip()]
+
+
+def render_pdf(cover_letter: str, position_title: str, company_name: str) -> bytes:
+    title_style, normal_style = _pdf_styles()
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+
+    story = [
+        Paragraph(f"Cover Letter - {position_title}", title_style),
+        Spacer(1, 20),
+        Paragraph(f"<b>Company:</b> {company_name}", normal_style),
+        Paragraph(f"<b>Position:</b> {position_title}", normal_style),
+        Spacer(1, 20),
+    ]
+    for para in _paragraphs(cover_letter):
+        story.append(Paragraph(para, normal_style))
+        story.append(Spacer(1, 12))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def render_docx(cover_letter: str, position_title: str, company_name: str) -> bytes:
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    doc = Document()
+    title = doc.add_heading(f'Cover Letter - {position_title}', 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    doc.add_paragraph(f'Company: {company_name}')
+    doc.add_paragraph(f'Position: {position_title}')
+    doc.add_paragraph('')  # Empty line
+    for para in _paragraphs(cover_letter):
+        doc.add_paragraph(para)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+RENDERERS = {"pdf": render_pdf, "docx": render_docx}
+
+
+class DocumentRenderer:
+    """Export 'service' for AnalysisExecutor workers: one per process, styles built up front"""
+
+    def render(self, fmt: str, cover_letter: str, position_title: str, company_name: str) -> bytes:
+        return RENDERERS[fmt](cover_letter, position_title, company_name)
+
+    def warm_up(self) -> None:
+        self.render("pdf", "Warm-up", "Position", "Company")
+
+
+def export_filename(company_name: str, position_title: str, fmt: str) -> str:
+    return f'cover_letter_{company_name.replace(" ", "_")}_{position_title.replace(" ", "_")}.{fmt}'
+
+
+def content_disposition(filename: str) -> Dict[str, str]:
+    """Attachment header in the same form FileResponse produces"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return {"Content-Disposition": f"attachment; filename*=utf-8''{quoted}"}
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+def archive_entry_name(index: int, company_name: str, position_title: str, fmt: str) -> str:
+    """Unique, flat entry name; the index keeps duplicates apart and preserves request order"""
+    filename = export_filename(company_name, position_title, fmt).replace("/", "_").replace("\\", "_")
+    return f"{index + 1:03d}_{filename}"
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStream:
+    """Builds a ZIP archive one entry at a time for streaming.
+
+    The sink is not seekable, so zipfile writes sizes in data descriptors
+    after each entry; ``add`` and ``close`` return the archive bytes that are
+    ready to send, and nothing else is kept. Entries are stored uncompressed:
+    PDF streams and DOCX files are compressed already.
+    """
+
+    def __init__(self):
+        self._buffer = _ChunkBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, "w", compression=zipfile.ZIP_STORED)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        self._zip.writestr(zipfile.ZipInfo(name, date_time=time.localtime()[:6]), data)
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        self._zip.close()
+        return self._buffer.drain()
@@ -0,0 +1,61 @@
+"""
+Cache of rendered PDF/DOCX exports, with the ETag helpers that go with it
+"""
+
+import hashlib
+from typing import Optional
+
+from .cache import TieredCache, content_key
+
+
+class ExportCache:
+    """Rendered document bytes keyed by format, letter text, title and company.
+
+    ``render_version`` is part of every key, so a layout change in the
+    renderer never serves documents built by the old one. Lookups are
+    coroutines: blobs for the SQLite tier are read and written on a thread.
+    """
+
+    def __init__(self, cache: TieredCache, render_version: str):
+        self.cache = cache
+        self.render_version = render_version
+
+    def key(self, fmt: str, cover_letter: str, position_title: str, company_name: str) -> str:
+        return content_key("export", self.render_version, fmt, cover_letter, position_title, company_name)
+
+    async def get(self, fmt: str, cover_letter: str, position_title: str, company_name: str) -> Optional[bytes]:
+        return await self.cache.get_async(self.key(fmt, cover_letter, position_title, company_name))
+
+    async def set(self, fmt: str, cover_letter: str, position_title: str, company_name: str, content: bytes) -> None:
+        await self.cache.set_async(self.key(fmt, cover_letter, position_title, company_name), content)
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "render_version": self.render_version}
+
+    def close(self) -> None:
+        self.cache.close()
+
+
+def strong_etag(content: bytes) -> str:
+    """Strong validator over the exact bytes served.
+
+    Rendering embeds timestamps, so the same letter rendered twice gives
+    different bytes; hashing the bytes (not the inputs) keeps the ETag honest
+    when an entry is evicted and rendered again.
+    """
+    return f'"{hashlib.sha256(content).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match evaluation: ``*`` or any listed tag, compared weakly as RFC 9110 requires"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
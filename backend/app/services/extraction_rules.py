@@ -0,0 +1,128 @@
+"""
+Data-driven extraction rules: loaded from a versioned JSON file, compiled once, hot-reloaded
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+from ..settings import settings
+
+
+class ExtractionRules:
+    """Compiled form of a rule file.
+
+    The skill patterns are joined into a single alternation so the text is
+    scanned once; each pattern keeps its one capture group, and the group
+    that matched is the skill. Word lists become frozen sets.
+    """
+
+    def __init__(self, data: Dict, digest: str = ""):
+        self.version = str(data["version"])
+        # Content hash, so an edit that forgets to bump "version" still changes cache keys
+        self.digest = digest
+        self.skill_pattern: Pattern = re.compile("|".join(f"(?:{p})" for p in data["skill_patterns"]))
+        self.stop_terms: FrozenSet[str] = frozenset(data.get("stop_terms", []))
+        self.non_skill_words: FrozenSet[str] = frozenset(
+            word for words in data.get("non_skill_words", {}).values() for word in words
+        )
+        self.cleanup: List[Tuple[Pattern, str]] = [
+            (re.compile(rule["pattern"]), rule.get("replace", "")) for rule in data.get("cleanup", [])
+        ]
+        self.min_length = int(data.get("min_length", 3))
+        self.max_words = int(data.get("max_words", 3))
+        self.max_skills = int(data.get("max_skills", 10))
+        self.requirement_indicators: Tuple[str, ...] = tuple(data.get("requirement_indicators", []))
+        self.title_keywords: Tuple[str, ...] = tuple(data.get("title_keywords", []))
+
+    @classmethod
+    def from_file(cls, path: str) -> "ExtractionRules":
+        with open(path, "rb") as fh:
+            raw = fh.read()
+        return cls(json.loads(raw.decode("utf-8")), hashlib.sha256(raw).hexdigest()[:12])
+
+    def pattern_skills(self, text_lower: str) -> List[str]:
+        """Captured skills of every pattern match, in text order"""
+        return [m.group(m.lastindex).strip() for m in self.skill_pattern.finditer(text_lower)]
+
+    def clean(self, skill: str) -> str:
+        skill = skill.strip().lower()
+        for pattern, replacement in self.cleanup:
+            skill = pattern.sub(replacement, skill)
+        return skill
+
+    def is_skill(self, skill: str) -> bool:
+        return (
+            skill not in self.non_skill_words
+            and len(skill) >= self.min_length
+            and len(skill.split()) <= self.max_words
+            and not skill.endswith(".")
+            and not any(char.isdigit() for char in skill)
+        )
+
+
+class RuleLoader:
+    """Serves the current rules and recompiles them when the file changes.
+
+    The file's mtime is checked at most every ``reload_interval`` seconds
+    (0 disables reloading). Each process holds its own loader, so analysis
+    workers pick up an edited file without being restarted. A file that
+    fails to load or compile is reported and the previous rules stay active.
+    """
+
+    def __init__(self, path: str, reload_interval: float = 0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._mtime = os.path.getmtime(path)
+        self._failed_mtime: Optional[float] = None
+        self._rules = ExtractionRules.from_file(path)
+        self._checked_at = time.monotonic()
+
+    @property
+    def version(self) -> str:
+        rules = self.current()
+        return f"{rules.version}.{rules.digest}"
+
+    def current(self) -> ExtractionRules:
+        if self.reload_interval and time.monotonic() - self._checked_at >= self.reload_interval:
+            self._maybe_reload()
+        return self._rules
+
+    def _maybe_reload(self) -> None:
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError as e:
+                print(f"❌ Could not stat extraction rules at {self.path}: {e}")
+                return
+            if mtime in (self._mtime, self._failed_mtime):
+                return
+            try:
+                rules = ExtractionRules.from_file(self.path)
+            except (OSError, ValueError, KeyError, re.error) as e:
+                # Report a broken file once, not on every check
+                self._failed_mtime = mtime
+                print(f"❌ Could not reload extraction rules from {self.path}: {e}")
+                return
+            self._mtime = mtime
+            self._rules = rules
+            self.reloads += 1
+            print(f"✅ Extraction rules reloaded (version {rules.version})")
+
+
+_default_loader: Optional[RuleLoader] = None
+
+
+def default_rules() -> RuleLoader:
+    """Process-wide loader for settings.EXTRACTION_RULES_PATH"""
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = RuleLoader(settings.EXTRACTION_RULES_PATH, settings.EXTRACTION_RULES_RELOAD_INTERVAL)
+    return _default_loader
@@ -0,0 +1,92 @@
+"""
+Compiled gazetteer for finding known skill terms in text
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# A token is a run of word characters that may contain (and end in) the
+# symbols used by technology names, e.g. "c++", "c#", "node.js", "scikit-learn".
+# Trailing dots and dashes are not part of the token, so "python." -> "python".
+_TOKEN_RE = re.compile(r"\w(?:[\w+#.\-]*[\w+#])?")
+
+_TERM = "\0term"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased gazetteer tokens of ``text``"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SkillGazetteer:
+    """Token trie over skill terms, matched in one left-to-right pass.
+
+    Terms only match whole tokens, so "go" does not fire inside "good" and
+    "ai" does not fire inside "maintain". Multi-word terms such as
+    "sql server" are matched as token sequences.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._root: Dict = {}
+        self._size = 0
+        for term in terms:
+            self.add(term)
+
+    @classmethod
+    def from_file(cls, path: str, terms: Iterable[str] = ()) -> "SkillGazetteer":
+        """Build from a taxonomy file with one term per line (``#`` comments allowed)"""
+        gazetteer = cls(terms)
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    gazetteer.add(line)
+        return gazetteer
+
+    def add(self, term: str) -> None:
+        term = term.strip().lower()
+        tokens = tokenize(term)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _TERM not in node:
+            self._size += 1
+        node[_TERM] = term
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, term: str) -> bool:
+        node: Optional[Dict] = self._root
+        for token in tokenize(term):
+            node = node.get(token)
+            if node is None:
+                return False
+        return _TERM in node
+
+    def find_iter(self, text: str) -> Iterator[str]:
+        """Yield every leftmost-longest term occurrence in ``text``"""
+        tokens = tokenize(text)
+        i, n = 0, len(tokens)
+        while i < n:
+            node = self._root
+            match, match_end = None, i
+            j = i
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _TERM in node:
+                    match, match_end = node[_TERM], j
+            if match is None:
+                i += 1
+            else:
+                yield match
+                i = match_end
+
+    def find_all(self, text: str) -> List[str]:
+        """Distinct terms found in ``text``, in order of first occurrence"""
+        return list(dict.fromkeys(self.find_iter(text)))
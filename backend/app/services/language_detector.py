@@ -0,0 +1,131 @@
+"""
+Language identification over character trigram profiles
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Collection, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from ..settings import settings
+
+DEFAULT_LANGUAGE = "en"
+
+LANGUAGE_NAMES = {
+    "en": "English",
+    "tr": "Turkish",
+    "de": "German",
+    "fr": "French",
+    "es": "Spanish",
+}
+
+# Letters only: digits, punctuation and technology names like "c++" carry no language signal
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def _trigrams(text: str, ignore: Collection[str] = ()) -> Iterator[str]:
+    """Character trigrams of each word not in ``ignore``, padded with word boundaries"""
+    for word in _WORD_RE.findall(text.lower()):
+        if word in ignore:
+            continue
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3]
+
+
+@dataclass
+class LanguageGuess:
+    language: str
+    confidence: float
+
+
+class LanguageDetector:
+    """Naive Bayes over character trigrams, one profile per language.
+
+    Profiles are built once from sample texts. Detection lower-cases the text
+    once, walks its trigrams in a single pass and scores every language at
+    the same time with one gather over the log-probability matrix. Only the
+    first ``max_chars`` characters are read; a few sentences are plenty.
+
+    Technology names say nothing about the language but still tilt the
+    scores, and naive Bayes is overconfident on little evidence, so words of
+    the given skills are skipped, and text with fewer than ``min_trigrams``
+    usable trigrams or a best posterior under ``min_confidence`` is
+    attributed to the default language.
+    """
+
+    def __init__(
+        self,
+        samples: Dict[str, str],
+        default: str = DEFAULT_LANGUAGE,
+        max_chars: int = 2000,
+        min_trigrams: int = 20,
+        min_confidence: float = 0.0,
+    ):
+        self.languages: List[str] = sorted(samples)
+        self.default = default
+        self.max_chars = max_chars
+        self.min_trigrams = min_trigrams
+        self.min_confidence = min_confidence
+        self._index: Dict[str, int] = {}
+        counts: List[List[int]] = []
+        for column, language in enumerate(self.languages):
+            for gram in _trigrams(samples[language]):
+                row = self._index.setdefault(gram, len(counts))
+                if row == len(counts):
+                    counts.append([0] * len(self.languages))
+                counts[row][column] += 1
+        matrix = np.array(counts, dtype=np.float64).reshape(-1, len(self.languages))
+        # Add-one smoothing so a trigram unseen in one language is unlikely there, not impossible
+        self._log_probs = np.log((matrix + 1) / (matrix.sum(axis=0) + len(self._index)))
+
+    @classmethod
+    def from_directory(cls, path: str, **kwargs) -> "LanguageDetector":
+        """Build from a directory holding one ``<language>.txt`` sample per language"""
+        samples = {}
+        for name in os.listdir(path):
+            language, ext = os.path.splitext(name)
+            if ext == ".txt":
+                with open(os.path.join(path, name), encoding="utf-8") as fh:
+                    samples[language] = fh.read()
+        return cls(samples, **kwargs)
+
+    def detect(self, text: str, skills: Iterable[str] = ()) -> LanguageGuess:
+        """Most likely language of ``text``, ignoring the words of ``skills``"""
+        index = self._index
+        ignore = {word for skill in skills for word in _WORD_RE.findall(skill.lower())}
+        rows = [index[gram] for gram in _trigrams((text or "")[:self.max_chars], ignore) if gram in index]
+        if len(rows) < self.min_trigrams:
+            return LanguageGuess(self.default, 0.0)
+        scores = self._log_probs[rows].sum(axis=0)
+        # Posterior under a uniform prior
+        posterior = np.exp(scores - scores.max())
+        posterior /= posterior.sum()
+        best = int(posterior.argmax())
+        confidence = round(float(posterior[best]), 4)
+        if confidence < self.min_confidence:
+            return LanguageGuess(self.default, 0.0)
+        return LanguageGuess(self.languages[best], confidence)
+
+
+_default_detector: Optional[LanguageDetector] = None
+
+
+def default_detector() -> LanguageDetector:
+    """Process-wide detector built from LANGUAGE_SAMPLES_DIR on first use"""
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = LanguageDetector.from_directory(
+            settings.LANGUAGE_SAMPLES_DIR, min_confidence=settings.LANGUAGE_MIN_CONFIDENCE
+        )
+    return _default_detector
+
+
+def detect_language(text: str, skills: Iterable[str] = ()) -> str:
+    return default_detector().detect(text, skills).language
+
+
+def language_name(code: str) -> str:
+    return LANGUAGE_NAMES.get(code, code)
@@ -0,0 +1,99 @@
+"""
+Cover letter templates for the template provider, keyed by language and tone
+"""
+
+import os
+from string import Formatter
+from typing import Dict, List, Tuple
+
+from .language_detector import DEFAULT_LANGUAGE
+
+# Placeholders a template may use; see letter_values
+FIELDS = frozenset({"company_name", "position_title", "top_skills", "skill_count"})
+
+# Tone used when a language has no template for the requested one
+FALLBACK_TONE = "concise"
+
+
+class LetterTemplate:
+    """One template, parsed and checked once; rendering is a single str.format_map"""
+
+    def __init__(self, source: str, name: str = "<template>"):
+        for _, field, _, _ in Formatter().parse(source):
+            if field is not None and field not in FIELDS:
+                raise ValueError(f"{name}: unknown placeholder {{{field}}}")
+        self.name = name
+        self._format = source.strip().format_map
+
+    def render(self, values: Dict[str, object]) -> str:
+        return self._format(values)
+
+
+class TemplateRegistry:
+    """All templates of a ``<language>/<tone>.txt`` directory tree.
+
+    Adding a language or tone is a matter of adding a file. Lookups fall back
+    to the fallback tone and then to the default language, and each resolved
+    (language, tone) pair is remembered, so rendering never touches the disk
+    or the template parser.
+    """
+
+    def __init__(self, templates: Dict[Tuple[str, str], LetterTemplate], default_language: str = DEFAULT_LANGUAGE):
+        if not templates:
+            raise ValueError("No cover letter templates found")
+        self.templates = templates
+        self.default_language = default_language
+        self._resolved: Dict[Tuple[str, str], LetterTemplate] = {}
+
+    @classmethod
+    def from_directory(cls, path: str, **kwargs) -> "TemplateRegistry":
+        templates = {}
+        for language in sorted(os.listdir(path)):
+            language_dir = os.path.join(path, language)
+            if not os.path.isdir(language_dir):
+                continue
+            for name in sorted(os.listdir(language_dir)):
+                tone, ext = os.path.splitext(name)
+                if ext != ".txt":
+                    continue
+                with open(os.path.join(language_dir, name), encoding="utf-8") as fh:
+                    templates[(language, tone)] = LetterTemplate(fh.read(), f"{language}/{name}")
+        return cls(templates, **kwargs)
+
+    def get(self, language: str, tone: str) -> LetterTemplate:
+        template = self._resolved.get((language, tone))
+        if template is None:
+            template = self._resolve(language, tone)
+            self._resolved[(language, tone)] = template
+        return template
+
+    def _resolve(self, language: str, tone: str) -> LetterTemplate:
+        for key in (
+            (language, tone),
+            (language, FALLBACK_TONE),
+            (self.default_language, tone),
+            (self.default_language, FALLBACK_TONE),
+        ):
+            if key in self.templates:
+                return self.templates[key]
+        return next(iter(self.templates.values()))
+
+    def render(self, language: str, tone: str, values: Dict[str, object]) -> str:
+        return self.get(language, tone).render(values)
+
+    def languages(self) -> List[str]:
+        return sorted({language for language, _ in self.templates})
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+
+def letter_values(job_info: Dict, cv_skills: List[str], skill_matches: List[Dict]) -> Dict[str, object]:
+    """Placeholder values for one letter"""
+    matched_skills = [match["skill"] for match in skill_matches if match["matched"]]
+    return {
+        "company_name": job_info.get("company_name", "Tech Company"),
+        "position_title": job_info.get("position_title", "Software Engineer"),
+        "top_skills": ", ".join(matched_skills[:3] or ["software development"]),
+        "skill_count": len(cv_skills),
+    }
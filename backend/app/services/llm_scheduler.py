@@ -0,0 +1,144 @@
+"""
+Admission control for LLM generations: bounded concurrency with a priority queue
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List
+
+# Lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+
+class SchedulerOverloaded(Exception):
+    """Raised when a generation cannot be admitted; carries a Retry-After hint"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LlmScheduler:
+    """Caps in-flight generations and queues the rest by priority.
+
+    Requests beyond ``max_queue`` waiters are rejected immediately instead of
+    piling up behind the HTTP timeout, and waiters give up after
+    ``queue_timeout`` seconds. A released slot is handed straight to the
+    highest-priority waiter (FIFO within a priority).
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float = 0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._queued = 0
+        self._waiters: List[list] = []
+        self._seq = itertools.count()
+        # Gauges and counters
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.last_wait = 0.0
+        self.max_wait = 0.0
+        self._total_wait = 0.0
+        self._avg_service = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def retry_after(self) -> int:
+        """Seconds until a new request would plausibly get a slot"""
+        if not self._avg_service:
+            return 1
+        return max(1, math.ceil(self._avg_service * (self._queued + 1) / self.max_in_flight))
+
+    def ensure_capacity(self) -> None:
+        """Reject up front when a new request would have to be turned away"""
+        if self._in_flight >= self.max_in_flight and self._queued >= self.max_queue:
+            self.rejected += 1
+            raise SchedulerOverloaded("LLM queue is full", self.retry_after())
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        if self._in_flight < self.max_in_flight and not self._queued:
+            self._in_flight += 1
+            self._record_wait(0.0)
+            return
+        self.ensure_capacity()
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._seq), future])
+        self._queued += 1
+        started = time.monotonic()
+        try:
+            if self.queue_timeout:
+                await asyncio.wait_for(future, self.queue_timeout)
+            else:
+                await future
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            else:
+                future.cancel()
+                self._queued -= 1
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise SchedulerOverloaded(
+                    f"Timed out after {self.queue_timeout:g}s waiting for an LLM slot", self.retry_after()
+                ) from None
+            raise
+        self._record_wait(time.monotonic() - started)
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.cancelled():
+                continue
+            # Hand the slot over directly; in_flight stays the same
+            self._queued -= 1
+            future.set_result(None)
+            return
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self._avg_service = elapsed if not self._avg_service else 0.8 * self._avg_service + 0.2 * elapsed
+            self.release()
+
+    def _record_wait(self, seconds: float) -> None:
+        self.admitted += 1
+        self.last_wait = seconds
+        self.max_wait = max(self.max_wait, seconds)
+        self._total_wait += seconds
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "max_queue": self.max_queue,
+            "queue_depth": self._queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_seconds_last": round(self.last_wait, 4),
+            "wait_seconds_avg": round(self._total_wait / self.admitted, 4) if self.admitted else 0.0,
+            "wait_seconds_max": round(self.max_wait, 4),
+            "service_seconds_avg": round(self._avg_service, 4),
+        }
@@ -0,0 +1,96 @@
+"""
+Deferred construction of expensive services and startup readiness tracking
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class ModelLoader:
+    """Builds a service (e.g. a spaCy pipeline) once, on first use or in the background.
+
+    ``get()`` blocks the calling thread until the service exists, so worker
+    threads that race the background load simply wait for it instead of
+    loading a second copy. ``load()`` does the same without blocking the
+    event loop. A ``warm_up()`` method on the service, if present, runs right
+    after construction so the first real request does not pay for it.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.load_seconds: Optional[float] = None
+        self.warm_up_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._service: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._service is not None
+
+    def get(self) -> Any:
+        if self._service is not None:
+            return self._service
+        with self._lock:
+            if self._service is None:
+                started = time.perf_counter()
+                try:
+                    service = self.factory()
+                    self.load_seconds = time.perf_counter() - started
+                    warm_up = getattr(service, "warm_up", None)
+                    if warm_up is not None:
+                        started = time.perf_counter()
+                        warm_up()
+                        self.warm_up_seconds = time.perf_counter() - started
+                except Exception as e:
+                    self.error = str(e)
+                    raise
+                self.error = None
+                self._service = service
+        return self._service
+
+    async def load(self) -> Any:
+        if self._service is not None:
+            return self._service
+        return await asyncio.get_running_loop().run_in_executor(None, self.get)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "warm_up_seconds": round(self.warm_up_seconds, 3) if self.warm_up_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+class Readiness:
+    """Startup state for the readiness probe: ready once every warm-up step has finished"""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.ready = False
+        self.time_to_ready: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def begin(self) -> None:
+        self.started_at = time.monotonic()
+        self.ready = False
+        self.time_to_ready = None
+        self.error = None
+
+    def mark_ready(self) -> None:
+        self.time_to_ready = time.monotonic() - self.started_at
+        self.ready = True
+
+    def mark_failed(self, error: Exception) -> None:
+        self.error = str(error)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "time_to_ready_seconds": round(self.time_to_ready, 3) if self.time_to_ready is not None else None,
+            "seconds_since_start": round(time.monotonic() - self.started_at, 3),
+            "error": self.error,
+        }
@@ -0,0 +1,146 @@
+"""
+Process pool that runs the CPU-bound analysis stage off the event loop
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+# Service instance owned by each pool worker, created once by the initializer
+_worker_service: Any = None
+
+
+def _init_worker(service_factory: Callable[[], Any]) -> None:
+    global _worker_service
+    _worker_service = service_factory()
+    warm_up = getattr(_worker_service, "warm_up", None)
+    if warm_up is not None:
+        warm_up()
+
+
+def _warm_up() -> bool:
+    return _worker_service is not None
+
+
+def _call(method: str, *args: Any) -> Any:
+    return getattr(_worker_service, method)(*args)
+
+
+class AnalysisQueueFull(Exception):
+    """Raised when the executor already holds its maximum number of submissions"""
+
+
+class AnalysisExecutor:
+    """Runs NLP service methods in worker processes with a bounded queue.
+
+    Every worker loads its own model through ``service_factory`` when it
+    starts. With ``workers=0`` calls run on the default thread pool against
+    the service returned by ``local_factory`` (``service_factory`` if not
+    given), which still keeps them off the event loop. Any picklable service
+    factory works; the export pool runs a DocumentRenderer the same way.
+
+    A worker that dies (OOM kill, segfault) breaks the whole pool; the next
+    call that notices rebuilds it and retries its submission once.
+    """
+
+    def __init__(
+        self,
+        service_factory: Callable[[], Any],
+        workers: int = 1,
+        max_pending: int = 32,
+        local_factory: Optional[Callable[[], Any]] = None,
+        name: str = "Analysis",
+    ):
+        self.service_factory = service_factory
+        self.workers = max(0, workers)
+        self.capacity = max(1, self.workers) + max(0, max_pending)
+        self.local_factory = local_factory
+        self.name = name
+        self._local_service: Any = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._started: Optional[asyncio.Future] = None
+        self._pending = 0
+        self.warmed_up = self.workers == 0
+        self.broken = False
+        self.restarts = 0
+
+    async def start(self) -> None:
+        """Spawn the workers and wait until each has loaded its model"""
+        if self.workers == 0:
+            return
+        if self._pool is not None:
+            # A second caller waits for the same warm-up
+            if self._started is not None:
+                await asyncio.shield(self._started)
+            return
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.service_factory,),
+        )
+        # Submitting one task per worker before any completes spawns all of them
+        warm_ups = [asyncio.wrap_future(self._pool.submit(_warm_up)) for _ in range(self.workers)]
+        self._started = asyncio.gather(*warm_ups)
+        await asyncio.shield(self._started)
+        self.warmed_up = True
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._started = None
+            self.warmed_up = self.workers == 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, method: str, *args: Any) -> Any:
+        """Call ``method`` on the NLP service without blocking the event loop"""
+        if self._pending >= self.capacity:
+            raise AnalysisQueueFull(f"{self.name} queue is full ({self.capacity} pending)")
+        self._pending += 1
+        try:
+            if self.workers and self._pool is None:
+                # Called before startup spawned the workers: start them rather than load a model here
+                await self.start()
+            loop = asyncio.get_running_loop()
+            if self._pool is None:
+                return await loop.run_in_executor(None, self._call_local, method, *args)
+            pool = self._pool
+            try:
+                return await loop.run_in_executor(pool, _call, method, *args)
+            except BrokenProcessPool:
+                await self._restart(pool)
+                return await loop.run_in_executor(self._pool, _call, method, *args)
+        finally:
+            self._pending -= 1
+
+    async def _restart(self, broken_pool: ProcessPoolExecutor) -> None:
+        """Replace a pool that lost a worker; concurrent callers share one rebuild"""
+        if self._pool is broken_pool:
+            print(f"❌ {self.name} worker pool is broken, restarting it")
+            self.broken = True
+            self.shutdown()
+            self.restarts += 1
+        await self.start()
+        self.broken = False
+
+    def _call_local(self, method: str, *args: Any) -> Any:
+        # Resolved on the worker thread so a model that is still loading never blocks the loop
+        if self._local_service is None:
+            self._local_service = (self.local_factory or self.service_factory)()
+        return getattr(self._local_service, method)(*args)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "warmed_up": self.warmed_up,
+            "pending": self._pending,
+            "capacity": self.capacity,
+            "broken": self.broken,
+            "restarts": self.restarts,
+        }
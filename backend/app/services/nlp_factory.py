@@ -0,0 +1,47 @@
+"""
+Selects the NLP analysis engine from the NLP_ENGINE setting
+"""
+
+from typing import Any, Type
+
+from ..settings import settings
+
+ENGINES = ("spacy", "nltk")
+
+
+def engine_class() -> Type:
+    """Service class for the configured engine; imports only that engine's dependencies"""
+    if settings.NLP_ENGINE == "spacy":
+        from .spacy_service import SpaCyService
+        return SpaCyService
+    if settings.NLP_ENGINE == "nltk":
+        from .nlp_service import NLPService
+        return NLPService
+    raise ValueError(f"Unknown NLP_ENGINE {settings.NLP_ENGINE!r}; expected one of {', '.join(ENGINES)}")
+
+
+def create_nlp_service() -> Any:
+    """Build the configured service; module-level so spawned workers can pickle it"""
+    return engine_class()()
+
+
+def engine_model_name() -> str:
+    """Model behind the configured engine, for cache keys; does not load it"""
+    return settings.SPACY_MODEL if settings.NLP_ENGINE == "spacy" else settings.NLP_ENGINE
+
+
+def engine_ruleset_version() -> str:
+    """Current rule-set version of the configured engine; changes when its rule file is reloaded"""
+    return engine_class().ruleset_version()
+
+
+def create_skill_comparer() -> Any:
+    """Skill comparison for the API process without loading the spaCy model.
+
+    The nltk engine has its own matching rules and no model, so its service
+    doubles as the comparer.
+    """
+    if settings.NLP_ENGINE == "spacy":
+        from .skill_comparison import SkillComparer
+        return SkillComparer(threshold=settings.SKILL_MATCH_THRESHOLD)
+    return engine_class()()
@@ -1,47 +1,40 @@
 """
-NLP Service for keyword extraction and text analysis
+NLTK-based NLP service: a lightweight alternative to SpaCyService (NLP_ENGINE=nltk)
 """
 
 import re
-import nltk
-from typing import List, Dict, Tuple
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.tag import pos_tag
-from nltk.chunk import ne_chunk
-import logging
+from typing import List, Dict
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+import nltk
+from nltk.corpus.reader import WordListCorpusReader
+from nltk.tokenize import PunktSentenceTokenizer, RegexpTokenizer
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+from .analysis import ApplicationAnalysis, CvAnalysis, PostingAnalysis
+from .gazetteer import SkillGazetteer
+from .language_detector import detect_language
+from ..settings import settings
 
-try:
-    nltk.data.find('taggers/averaged_perceptron_tagger')
-except LookupError:
-    nltk.download('averaged_perceptron_tagger')
+class NLPService:
+    """NLP service for text analysis and keyword extraction.
 
-try:
-    nltk.data.find('chunkers/maxent_ne_chunker')
-except LookupError:
-    nltk.download('maxent_ne_chunker')
+    Needs no model and no network: stop words come from the bundled NLTK data
+    directory (NLTK_DATA_DIR), tokens from a regular expression and sentences
+    from an untrained Punkt tokenizer. Results have the same shape as
+    SpaCyService, so either can back the API.
+    """
 
-try:
-    nltk.data.find('corpora/words')
-except LookupError:
-    nltk.download('words')
+    # Bump whenever the extraction rules change so cached analyses are invalidated
+    RULESET_VERSION = "3"
 
-class NLPService:
-    """NLP service for text analysis and keyword extraction"""
-    
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+        self.model_name = "nltk"
+        # Search the bundled data first; NLTK only reads corpora under nltk.data.path
+        if settings.NLTK_DATA_DIR not in nltk.data.path:
+            nltk.data.path.insert(0, settings.NLTK_DATA_DIR)
+        stopwords = WordListCorpusReader(nltk.data.find("corpora/stopwords"), ["english", "turkish"], encoding="utf-8")
+        self.stop_words = set(stopwords.words())
+        self.word_tokenizer = RegexpTokenizer(r"\w(?:[\w+#.\-]*[\w+#])?")
+        self.sentence_tokenizer = PunktSentenceTokenizer()
         # Add common job-related stop words
         self.stop_words.update([
             'experience', 'years', 'required', 'preferred', 'skills', 'knowledge',
@@ -58,6 +51,13 @@ class NLPService:
             'tools': ['git', 'jira', 'confluence', 'slack', 'figma', 'adobe', 'photoshop']
         }
         
+        # Compiled lookup over every category, built once per service
+        all_skills = [skill for skills in self.technical_skills.values() for skill in skills]
+        if settings.SKILL_TAXONOMY_PATH:
+            self.skill_gazetteer = SkillGazetteer.from_file(settings.SKILL_TAXONOMY_PATH, all_skills)
+        else:
+            self.skill_gazetteer = SkillGazetteer(all_skills)
+        
         # Job titles and positions
         self.job_titles = [
             'software engineer', 'developer', 'programmer', 'data scientist', 'analyst',
@@ -74,27 +74,20 @@ class NLPService:
         if not text:
             return []
         
-        text = text.lower()
         extracted_skills = []
         
-        # Extract skills from technical_skills dictionary
-        for category, skills in self.technical_skills.items():
-            for skill in skills:
-                if skill in text:
-                    extracted_skills.append(skill)
-        
-        # Extract additional skills using POS tagging
-        tokens = word_tokenize(text)
-        pos_tags = pos_tag(tokens)
-        
-        # Look for nouns and proper nouns that might be skills
-        for word, tag in pos_tags:
-            if tag.startswith('NN') and len(word) > 2 and word.lower() not in self.stop_words:
-                # Check if it looks like a technical term
+        # Extract known skills in a single gazetteer pass
+        extracted_skills.extend(self.skill_gazetteer.find_all(text))
+        
+        # Add other tokens that look like technical terms (CamelCase, versions, known skills)
+        for word in self.word_tokenizer.tokenize(text):
+            word_lower = word.lower()
+            if len(word) > 2 and word_lower not in self.stop_words and not word.isdigit():
                 if self._is_technical_term(word):
-                    extracted_skills.append(word.lower())
+                    extracted_skills.append(word_lower)
         
-        return list(set(extracted_skills))  # Remove duplicates
+        # Ordered and capped like SpaCyService so both engines return the same shape
+        return list(dict.fromkeys(extracted_skills))[:10]
     
     def extract_job_info(self, text: str) -> Dict[str, str]:
         """Extract job information from posting"""
@@ -123,8 +116,8 @@ class NLPService:
         if not text:
             return []
         
-        requirements = []
-        sentences = sent_tokenize(text)
+        requirements: List[str] = []
+        sentences = self.sentence_tokenizer.tokenize(text)
         
         # Look for sentences that contain requirement indicators
         requirement_indicators = [
@@ -139,7 +132,7 @@ class NLPService:
                 skills = self.extract_skills_from_text(sentence)
                 requirements.extend(skills)
         
-        return list(set(requirements))
+        return list(dict.fromkeys(requirements))
     
     def analyze_cv_skills(self, cv_text: str) -> List[str]:
         """Analyze CV and extract skills"""
@@ -148,6 +141,50 @@ class NLPService:
         
         return self.extract_skills_from_text(cv_text)
     
+    def analyze_cv(self, cv_text: str) -> CvAnalysis:
+        """CV skills with the rule-set version they were extracted with"""
+        return CvAnalysis(skills=self.analyze_cv_skills(cv_text), ruleset_version=self.ruleset_version())
+    
+    def analyze_posting(self, text: str) -> PostingAnalysis:
+        """Run every posting extractor; same result type as SpaCyService"""
+        if not text:
+            return PostingAnalysis()
+        skills = self.extract_skills_from_text(text)
+        return PostingAnalysis(
+            job_info=self.extract_job_info(text),
+            skills=skills,
+            key_requirements=self.extract_key_requirements(text),
+            language=detect_language(text, skills),
+            ruleset_version=self.ruleset_version(),
+        )
+    
+    def analyze_postings(self, texts: List[str], batch_size: int = 64, n_process: int = 1) -> List[PostingAnalysis]:
+        """Batch variant of analyze_posting; batch_size and n_process are accepted for parity"""
+        return [self.analyze_posting(text) for text in texts]
+    
+    def analyze_application(self, job_text: str, cv_text: str) -> ApplicationAnalysis:
+        return self.compare_skills(self.analyze_posting(job_text), self.analyze_cv_skills(cv_text))
+    
+    def compare_skills(self, posting: PostingAnalysis, cv_skills: List[str]) -> ApplicationAnalysis:
+        """Match an analysed posting against CV skills"""
+        skill_matches = self.match_skills(posting.skills, cv_skills)
+        missing_skills = self.find_missing_skills(posting.skills, cv_skills)
+        return ApplicationAnalysis(
+            posting=posting,
+            cv_skills=cv_skills,
+            skill_matches=skill_matches,
+            missing_skills=missing_skills,
+            recommendations=self.generate_recommendations(skill_matches, missing_skills),
+        )
+    
+    @classmethod
+    def ruleset_version(cls) -> str:
+        return cls.RULESET_VERSION
+    
+    def warm_up(self) -> None:
+        """Exercise the tokenizers once so the first request does not build their state"""
+        self.analyze_posting("Senior Python Developer at Example Corp. Required: 3+ years of experience with Docker.")
+    
     def match_skills(self, job_skills: List[str], cv_skills: List[str]) -> List[Dict]:
         """Match job skills with CV skills"""
         matches = []
@@ -229,12 +266,7 @@ class NLPService:
             return True
         
         # Check if it's in our technical skills
-        word_lower = word.lower()
-        for skills in self.technical_skills.values():
-            if word_lower in skills:
-                return True
-        
-        return False
+        return word.lower() in self.skill_gazetteer
     
     def _extract_job_title(self, text: str) -> str:
         """Extract job title from text"""
@@ -264,7 +296,7 @@ class NLPService:
         """Extract experience requirement from text"""
         # Look for experience patterns
         experience_patterns = [
-            r'(\d+)[\+]?\s*years?\s*experience',
+            r'(\d+)[\+]?\s*years?\s*(?:of\s*)?experience',
             r'experience.*?(\d+)[\+]?\s*years?',
             r'(\d+)[\+]?\s*years?\s*in',
         ]
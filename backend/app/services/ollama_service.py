@@ -1,7 +1,12 @@
 import os
-from typing import List, Dict
+import json
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import httpx
-from .ai_service import AiService
+from .ai_service import AiService, GenerationResult
+from .cache import TieredCache, content_key
+from .language_detector import DEFAULT_LANGUAGE, language_name
+from .llm_scheduler import LlmScheduler, PRIORITY_INTERACTIVE
+from ..settings import settings
 
 
 class OllamaAiService(AiService):
@@ -9,20 +14,197 @@ class OllamaAiService(AiService):
         self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.model = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
         self.timeout_seconds = float(os.getenv("AI_TIMEOUT", "60"))
+        self.limits = httpx.Limits(
+            max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OLLAMA_MAX_KEEPALIVE,
+            keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(
+            self.timeout_seconds,
+            connect=settings.OLLAMA_CONNECT_TIMEOUT,
+            read=settings.OLLAMA_READ_TIMEOUT or self.timeout_seconds,
+            pool=settings.OLLAMA_POOL_TIMEOUT,
+        )
+        # Admission control in front of every generation
+        self.scheduler = LlmScheduler(
+            max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+            max_queue=settings.LLM_MAX_QUEUE,
+            queue_timeout=settings.LLM_QUEUE_TIMEOUT,
+        )
+        # Optional response cache keyed by model, prompt and sampling options
+        self.response_cache: Optional[TieredCache] = None
+        if settings.LLM_CACHE_ENABLED:
+            self.response_cache = TieredCache.from_settings(
+                settings.LLM_CACHE_MAX_BYTES,
+                settings.LLM_CACHE_TTL,
+                settings.LLM_CACHE_PATH,
+                settings.LLM_CACHE_DISK_MAX_BYTES,
+            )
+        # Chat template halves for raw (prefix-reuse) prompts: head + prompt + tail
+        self.template_head, _, self.template_tail = settings.OLLAMA_PROMPT_TEMPLATE.partition("{prompt}")
+        # One pooled client per process, opened and closed by the app lifespan
+        self._client: Optional[httpx.AsyncClient] = None
+        self._in_flight = 0
+        self._requests = 0
 
-    async def _generate(self, prompt: str, temperature: float = 0.7, max_tokens: int = 600) -> str:
-        url = f"{self.base_url}/api/generate"
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=self.limits)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self.response_cache is not None:
+            self.response_cache.close()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Scripts that never run the lifespan still get the shared client
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    def pool_stats(self) -> Dict[str, int]:
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        return {
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "in_flight": self._in_flight,
+            "requests_total": self._requests,
+        }
+
+    async def _generate(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 600,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> str:
+        result = await self._generate_result(prompt, temperature, max_tokens, priority)
+        return result.text
+
+    async def _generate_result(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 600,
+        priority: int = PRIORITY_INTERACTIVE,
+        context: Optional[List[int]] = None,
+        seed: Optional[int] = None,
+        reuse_cached: bool = False,
+        cache_prompt: Optional[str] = None,
+        raw: bool = False,
+        store: bool = True,
+    ) -> GenerationResult:
+        """One non-streaming generation; ``context`` continues from an evaluated prefix.
+
+        Results are stored in the response cache under ``cache_prompt`` (the
+        full logical prompt, defaulting to ``prompt``) and are only served
+        from it when ``reuse_cached`` is set (``store=False`` skips storing).
+        ``raw`` prompts skip Ollama's chat template and are cached apart from
+        templated ones.
+        """
+        cache_prompt = cache_prompt or prompt
+        if reuse_cached:
+            cached = await self.cached_result(cache_prompt, temperature, max_tokens, seed, raw=raw)
+            if cached is not None:
+                return cached
+        options = {"temperature": temperature, "num_predict": max_tokens}
+        if seed is not None:
+            options["seed"] = seed
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "options": {"temperature": temperature, "num_predict": max_tokens},
+            "options": options,
             "stream": False,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        }
+        if raw:
+            payload["raw"] = True
+        if context:
+            payload["context"] = context
+        client = await self._get_client()
+        async with self.scheduler.slot(priority):
+            self._in_flight += 1
+            self._requests += 1
+            try:
+                r = await client.post("/api/generate", json=payload)
+            finally:
+                self._in_flight -= 1
+        r.raise_for_status()
+        result = GenerationResult.from_ollama(r.json())
+        if store and self.response_cache is not None and max_tokens > 0:
+            await self.response_cache.set_async(
+                self._response_cache_key(cache_prompt, temperature, max_tokens, seed, raw),
+                json.dumps({"text": result.text, "eval_count": result.eval_count}).encode("utf-8"),
+            )
+        return result
+
+    def _response_cache_key(
+        self, prompt: str, temperature: float, max_tokens: int, seed: Optional[int], raw: bool = False
+    ) -> str:
+        if raw:
+            # Raw prompts are sent with this service's template, not Ollama's; see prime_cover_letter_prefix
+            return content_key(self.model, "raw", self.template_head, self.template_tail, prompt, temperature, max_tokens, seed)
+        return content_key(self.model, prompt, temperature, max_tokens, seed)
+
+    async def cached_result(
+        self, prompt: str, temperature: float, max_tokens: int, seed: Optional[int] = None, raw: bool = False
+    ) -> Optional[GenerationResult]:
+        """Cached response, if any; the SQLite tier (LLM_CACHE_PATH) is read on a thread"""
+        if self.response_cache is None:
+            return None
+        data = await self.response_cache.get_async(self._response_cache_key(prompt, temperature, max_tokens, seed, raw))
+        if data is None:
+            return None
+        return GenerationResult(cached=True, **json.loads(data))
+
+    async def _generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 600,
+        priority: int = PRIORITY_INTERACTIVE,
+        seed: Optional[int] = None,
+    ) -> AsyncIterator[Dict]:
+        """Yield Ollama's streamed chunks; the last one has done=True and the eval stats.
+
+        A completed stream is stored in the response cache like a
+        non-streaming generation of the same prompt.
+        """
+        options = {"temperature": temperature, "num_predict": max_tokens}
+        if seed is not None:
+            options["seed"] = seed
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "options": options,
+            "stream": True,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
         }
-        async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-            r = await client.post(url, json=payload)
-            r.raise_for_status()
-            data = r.json()
-            return data.get("response", "")
+        parts: List[str] = []
+        client = await self._get_client()
+        async with self.scheduler.slot(priority):
+            self._in_flight += 1
+            self._requests += 1
+            try:
+                async with client.stream("POST", "/api/generate", json=payload) as r:
+                    r.raise_for_status()
+                    async for line in r.aiter_lines():
+                        if line.strip():
+                            chunk = json.loads(line)
+                            parts.append(chunk.get("response", ""))
+                            if chunk.get("done") and self.response_cache is not None and max_tokens > 0:
+                                await self.response_cache.set_async(
+                                    self._response_cache_key(prompt, temperature, max_tokens, seed),
+                                    json.dumps({"text": "".join(parts), "eval_count": chunk.get("eval_count")}).encode("utf-8"),
+                                )
+                            yield chunk
+            finally:
+                self._in_flight -= 1
 
     async def summarize_job_posting(self, job_posting_text: str) -> str:
         prompt = f"""You are a professional job analyst. Analyze this job posting and extract the key requirements, responsibilities, and skills needed.
@@ -52,36 +234,42 @@ Please provide a concise summary in 3 bullet points focusing on:
 Summary:"""
         return await self._generate(prompt, temperature=0.3, max_tokens=300)
 
-    async def draft_cover_letter(
+    def _build_cover_letter_prompt(
         self,
         job_info: Dict,
-        cv_skills: List[str],
         skill_matches: List[Dict],
         tone: str,
         custom_instructions: str = None,
-        variants: int = 1
-    ) -> str | List[str]:
+    ) -> Tuple[str, bool]:
+        """Return the cover letter prompt and whether it was written in Turkish"""
+        prefix, suffix, is_turkish = self._build_cover_letter_prompt_parts(job_info, skill_matches, tone, custom_instructions)
+        return prefix + suffix, is_turkish
+
+    def _build_cover_letter_prompt_parts(
+        self,
+        job_info: Dict,
+        skill_matches: List[Dict],
+        tone: str,
+        custom_instructions: str = None,
+    ) -> Tuple[str, str, bool]:
+        """Split the prompt into a tone-independent prefix and a short tone suffix.
+
+        Variants of one request share the prefix, so Ollama can evaluate it once.
+        """
         company = job_info.get("company_name", "Company")
         title = job_info.get("position_title", "Role")
         years_exp = job_info.get("years_of_experience", "")
         achievements = job_info.get("key_achievements", "")
         matched = ", ".join([m["skill"] for m in skill_matches if m.get("matched")]) or "relevant skills"
         
-        # Detect language from job posting and CV
-        job_text = job_info.get("job_posting_text", "")
-        cv_text = job_info.get("cv_text", "")
-        
-        # Enhanced language detection
-        turkish_words = ["ve", "ile", "için", "bu", "bir", "da", "de", "gibi", "olarak", "üzerinde", "yazılım", "geliştirici", "deneyim", "konularında", "uzmanım", "arıyoruz", "gerekli", "şart"]
-        english_words = ["the", "and", "with", "for", "this", "a", "an", "in", "on", "at", "software", "developer", "experience", "skills", "required", "looking", "need"]
-        
-        turkish_count = sum(1 for word in turkish_words if word in job_text.lower() or word in cv_text.lower())
-        english_count = sum(1 for word in english_words if word in job_text.lower() or word in cv_text.lower())
-        
-        is_turkish = turkish_count > english_count
+        # Detected once with the posting analysis; languages without their own
+        # prompt get the English one with an instruction to answer in theirs
+        language = job_info.get("language", DEFAULT_LANGUAGE)
+        is_turkish = language == "tr"
+        language_line = f"\n- Language: write the letter in {language_name(language)}" if language != DEFAULT_LANGUAGE else ""
         
         if is_turkish:
-            base_prompt = f"""Sen profesyonel bir ön yazı yazarısın. '{company}' şirketindeki '{title}' pozisyonu için {tone} bir ön yazı yaz.
+            prefix = f"""Sen profesyonel bir ön yazı yazarısın. '{company}' şirketindeki '{title}' pozisyonu için bir ön yazı yaz.
 
 İŞ İLANI:
 {job_info.get('job_posting_text', '')}
@@ -90,7 +278,6 @@ CV BİLGİLERİ:
 {job_info.get('cv_text', '')}
 
 Temel gereksinimler:
-- Ton: {tone}
 - Pozisyon: {title}
 - Şirket: {company}
 - Bu eşleşen yetenekleri vurgula: {matched}
@@ -111,11 +298,14 @@ Yönergeler:
 - Mülakat için bir çağrı ile bitir
 - Profesyonel ama etkileyici dil kullan
 - Her seferinde farklı bir yaklaşım kullan
-- Kişisel ve özgün ol
+- Kişisel ve özgün ol"""
+            suffix = f"""
+
+- Ton: {tone}
 
 Ön Yazı:"""
         else:
-            base_prompt = f"""You are a professional cover letter writer. Write a {tone} cover letter for the position '{title}' at '{company}'.
+            prefix = f"""You are a professional cover letter writer. Write a cover letter for the position '{title}' at '{company}'.
 
 JOB POSTING:
 {job_info.get('job_posting_text', '')}
@@ -124,12 +314,11 @@ CV INFORMATION:
 {job_info.get('cv_text', '')}
 
 Key requirements:
-- Tone: {tone}
 - Position: {title}
 - Company: {company}
 - Highlight these matched skills: {matched}
 - Length: Maximum 250 words
-- Structure: Professional greeting, 2-3 paragraphs, professional closing
+- Structure: Professional greeting, 2-3 paragraphs, professional closing{language_line}
 
 Additional context to include:
 {f"- Years of experience: {years_exp}" if years_exp else ""}
@@ -145,15 +334,93 @@ Guidelines:
 - End with a call to action for an interview
 - Use professional but engaging language
 - Use a different approach each time
-- Be personal and unique
+- Be personal and unique"""
+            suffix = f"""
+
+- Tone: {tone}
 
 Cover Letter:"""
         
         if custom_instructions:
-            base_prompt += f"\n\nAdditional instructions: {custom_instructions}"
+            prefix += f"\n\nAdditional instructions: {custom_instructions}"
+        
+        return prefix, suffix, is_turkish
+
+    async def prime_cover_letter_prefix(
+        self,
+        job_info: Dict,
+        skill_matches: List[Dict],
+        custom_instructions: str = None,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> GenerationResult:
+        """Evaluate the shared prompt prefix once; the result's context seeds each variant.
+
+        The prefix is sent raw after the template's head, so the context holds
+        exactly the opening of the templated full prompt and each variant only
+        adds its suffix and the template's tail. Ollama treats num_predict=0 as
+        "no limit", so one token is sampled and cut from the context again.
+        """
+        prefix, _, _ = self._build_cover_letter_prompt_parts(job_info, skill_matches, "", custom_instructions)
+        result = await self._generate_result(
+            self.template_head + prefix, temperature=0.6, max_tokens=1, priority=priority, raw=True, store=False
+        )
+        if result.eval_count:
+            result.context = result.context[:-result.eval_count]
+        return result
+
+    async def draft_cover_letter_result(
+        self,
+        job_info: Dict,
+        cv_skills: List[str],
+        skill_matches: List[Dict],
+        tone: str,
+        custom_instructions: str = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        prefix_context: Optional[List[int]] = None,
+        seed: Optional[int] = None,
+        reuse_cached: bool = False,
+    ) -> GenerationResult:
+        """Draft one letter with eval statistics, optionally branching from a primed prefix"""
+        prefix, suffix, _ = self._build_cover_letter_prompt_parts(job_info, skill_matches, tone, custom_instructions)
+        if prefix_context:
+            return await self._generate_result(
+                suffix + self.template_tail, temperature=0.6, max_tokens=700, priority=priority, context=prefix_context,
+                seed=seed, reuse_cached=reuse_cached, cache_prompt=prefix + suffix, raw=True,
+            )
+        return await self._generate_result(
+            prefix + suffix, temperature=0.6, max_tokens=700, priority=priority,
+            seed=seed, reuse_cached=reuse_cached,
+        )
+
+    async def cached_cover_letter(
+        self,
+        job_info: Dict,
+        skill_matches: List[Dict],
+        tone: str,
+        custom_instructions: str = None,
+        seed: Optional[int] = None,
+    ) -> Optional[GenerationResult]:
+        """Cached letter for exactly these inputs, if one was generated before (either path)"""
+        prefix, suffix, _ = self._build_cover_letter_prompt_parts(job_info, skill_matches, tone, custom_instructions)
+        return (
+            await self.cached_result(prefix + suffix, temperature=0.6, max_tokens=700, seed=seed)
+            or await self.cached_result(prefix + suffix, temperature=0.6, max_tokens=700, seed=seed, raw=True)
+        )
+
+    async def draft_cover_letter(
+        self,
+        job_info: Dict,
+        cv_skills: List[str],
+        skill_matches: List[Dict],
+        tone: str,
+        custom_instructions: str = None,
+        variants: int = 1,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> str | List[str]:
+        base_prompt, is_turkish = self._build_cover_letter_prompt(job_info, skill_matches, tone, custom_instructions)
         
         if variants == 1:
-            return await self._generate(base_prompt, temperature=0.6, max_tokens=700)
+            return await self._generate(base_prompt, temperature=0.6, max_tokens=700, priority=priority)
         else:
             # Generate multiple variants with different approaches
             results = []
@@ -169,9 +436,34 @@ Cover Letter:"""
             
             for i in range(min(variants, len(variations))):
                 variant_prompt = f"{base_prompt}\n\n{variations[i]['suffix']}"
-                result = await self._generate(variant_prompt, temperature=variations[i]['temp'], max_tokens=700)
+                result = await self._generate(
+                    variant_prompt, temperature=variations[i]['temp'], max_tokens=700, priority=priority
+                )
                 results.append(result)
             
             return results
 
+    async def stream_cover_letter(
+        self,
+        job_info: Dict,
+        cv_skills: List[str],
+        skill_matches: List[Dict],
+        tone: str,
+        custom_instructions: str = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        seed: Optional[int] = None,
+        reuse_cached: bool = False,
+    ) -> AsyncIterator[Dict]:
+        """Streaming counterpart of draft_cover_letter for a single letter.
 
+        With ``reuse_cached`` a cached letter comes back as one final chunk
+        marked ``cached`` instead of being generated again.
+        """
+        if reuse_cached:
+            hit = await self.cached_cover_letter(job_info, skill_matches, tone, custom_instructions, seed=seed)
+            if hit is not None:
+                yield {"response": hit.text, "done": True, "eval_count": hit.eval_count, "cached": True}
+                return
+        base_prompt, _ = self._build_cover_letter_prompt(job_info, skill_matches, tone, custom_instructions)
+        async for chunk in self._generate_stream(base_prompt, temperature=0.6, max_tokens=700, priority=priority, seed=seed):
+            yield chunk
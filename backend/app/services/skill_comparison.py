@@ -0,0 +1,46 @@
+"""
+Model-free skill comparison: everything the API process needs after analysis
+"""
+
+from typing import Dict, List
+
+from .analysis import PostingAnalysis, ApplicationAnalysis
+from .skill_matcher import SkillMatcher
+
+
+class SkillComparer:
+    """Matches analysed posting skills against CV skills and derives recommendations.
+
+    It needs no spaCy model, so the API process can compare and rank while
+    the model itself lives only in the analysis worker processes.
+    """
+
+    def __init__(self, threshold: float = 0.65):
+        self.skill_matcher = SkillMatcher(threshold=threshold)
+
+    def compare_skills(self, posting: PostingAnalysis, cv_skills: List[str]) -> ApplicationAnalysis:
+        comparison = self.skill_matcher.compare(posting.skills, cv_skills)
+        skill_matches, missing_skills = comparison.matches, comparison.missing
+        return ApplicationAnalysis(
+            posting=posting,
+            cv_skills=cv_skills,
+            skill_matches=skill_matches,
+            missing_skills=missing_skills,
+            recommendations=self.generate_recommendations(skill_matches, missing_skills),
+        )
+
+    def match_skills(self, job_skills: List[str], cv_skills: List[str]) -> List[Dict]:
+        return self.skill_matcher.compare(job_skills, cv_skills).matches
+
+    def find_missing_skills(self, job_skills: List[str], cv_skills: List[str]) -> List[str]:
+        return self.skill_matcher.compare(job_skills, cv_skills).missing
+
+    def generate_recommendations(self, skill_matches: List[Dict], missing_skills: List[str]) -> List[str]:
+        recs: List[str] = []
+        matched_count = sum(1 for m in skill_matches if m["matched"])
+        total = len(skill_matches)
+        if total and matched_count < total * 0.5:
+            recs.append("Highlight your most relevant skills more prominently")
+        if missing_skills:
+            recs.append("Consider learning: " + ", ".join(missing_skills[:3]))
+        return recs
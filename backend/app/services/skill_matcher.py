@@ -0,0 +1,117 @@
+"""
+Fuzzy skill matching over hashed character n-gram vectors
+"""
+
+import re
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class SkillComparison:
+    """Per-job-skill match records plus the job skills with no match in the CV"""
+
+    matches: List[Dict]
+    missing: List[str]
+
+
+# Words are split on whitespace and joiners, so "react.js" shares every trigram of "react"
+_WORD_SPLIT = re.compile(r"[^\w+#]+")
+
+
+@lru_cache(maxsize=8192)
+def _ngram_buckets(skill: str, n: int, dim: int) -> Tuple[int, ...]:
+    """Hash buckets of the character n-grams of each word, padded with word boundaries"""
+    buckets = []
+    for word in _WORD_SPLIT.split(skill):
+        if not word:
+            continue
+        padded = f" {word} "
+        if len(padded) <= n:
+            buckets.append(zlib.crc32(padded.encode("utf-8")) % dim)
+            continue
+        for i in range(len(padded) - n + 1):
+            buckets.append(zlib.crc32(padded[i:i + n].encode("utf-8")) % dim)
+    return tuple(buckets)
+
+
+class SkillMatcher:
+    """Scores every job-skill/CV-skill pair with one matrix product.
+
+    Each skill becomes an L2-normalised vector of hashed character trigram
+    counts, so the product of the two matrices is the cosine similarity of
+    every pair. Word boundaries are part of the trigrams, which keeps
+    prefixes apart: "java" and "javascript" score about 0.47 and "machine
+    learning" and "deep learning" 0.6, both under the default threshold,
+    while "postgres"/"postgresql" score 0.78 and "react"/"react.js" 0.85.
+
+    Confidence is 1.0 for an exact (case-insensitive) match; a fuzzy match
+    maps its similarity linearly from [threshold, 1) onto [0.5, 0.95).
+    """
+
+    def __init__(self, threshold: float = 0.65, n: int = 3, dim: int = 1024):
+        self.threshold = threshold
+        self.n = n
+        self.dim = dim
+
+    def vectorize(self, skills: List[str]) -> np.ndarray:
+        buckets = [_ngram_buckets(skill, self.n, self.dim) for skill in skills]
+        rows = np.repeat(np.arange(len(skills)), [len(b) for b in buckets])
+        cols = np.fromiter((bucket for b in buckets for bucket in b), dtype=np.int64, count=len(rows))
+        matrix = np.zeros((len(skills), self.dim), dtype=np.float32)
+        # Repeated trigrams (and hash collisions) within a skill add up
+        cells, counts = np.unique(rows * self.dim + cols, return_counts=True)
+        matrix.reshape(-1)[cells] = counts
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def similarity(self, job_skills: List[str], cv_skills: List[str]) -> np.ndarray:
+        """Cosine similarity matrix, one row per job skill and one column per CV skill"""
+        return self.vectorize(job_skills) @ self.vectorize(cv_skills).T
+
+    def compare(self, job_skills: List[str], cv_skills: List[str]) -> SkillComparison:
+        job_lower = [skill.lower() for skill in job_skills]
+        cv_lower = list(dict.fromkeys(skill.lower() for skill in cv_skills))
+        cv_index = {skill: i for i, skill in enumerate(cv_lower)}
+
+        if job_lower and cv_lower:
+            scores = self.similarity(job_lower, cv_lower)
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(job_lower)), best]
+        else:
+            best = best_scores = None
+
+        matches: List[Dict] = []
+        missing: List[str] = []
+        for i, (skill, skill_lower) in enumerate(zip(job_skills, job_lower)):
+            if skill_lower in cv_index:
+                matches.append({
+                    "skill": skill,
+                    "matched": True,
+                    "confidence": 1.0,
+                    "cv_evidence": "Exact match found in CV",
+                })
+            elif best is not None and best_scores[i] >= self.threshold:
+                score = float(min(best_scores[i], 1.0))
+                span = 1.0 - self.threshold
+                confidence = 0.5 + 0.45 * ((score - self.threshold) / span if span > 0 else 1.0)
+                matches.append({
+                    "skill": skill,
+                    "matched": True,
+                    "confidence": round(min(confidence, 0.95), 2),
+                    "cv_evidence": f"Partial match: {cv_lower[best[i]]}",
+                })
+            else:
+                matches.append({
+                    "skill": skill,
+                    "matched": False,
+                    "confidence": 0.0,
+                    "cv_evidence": "Not found in CV",
+                })
+                missing.append(skill)
+        return SkillComparison(matches=matches, missing=missing)
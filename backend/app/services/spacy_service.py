@@ -2,31 +2,49 @@
 SpaCy-based NLP service for keyword extraction and text analysis
 """
 
-from typing import List, Dict
+from typing import List, Dict, Union
 import re
 import spacy
+from spacy.pipeline import Sentencizer
+from spacy.tokens import Doc, Span
+
+from .analysis import ApplicationAnalysis, CvAnalysis, PostingAnalysis
+from .extraction_rules import default_rules
+from .gazetteer import SkillGazetteer
+from .language_detector import detect_language
+from .skill_comparison import SkillComparer
+from ..settings import settings
 
 
 class SpaCyService:
     """NLP service powered by spaCy"""
 
+    # Bump whenever the extraction code changes so cached analyses are invalidated;
+    # edits to the rule file are versioned by the file itself (see ruleset_version)
+    RULESET_VERSION = "5"
+
+    # Pipeline components each extractor reads; the rest are disabled for its parse.
+    # An empty list means the tokenizer alone is enough.
+    EXTRACTOR_COMPONENTS = {
+        "skills": [],  # token text and casing
+        "key_requirements": [],  # sentence boundaries come from the rule-based sentencizer
+        "job_info": ["tok2vec", "tagger", "attribute_ruler", "parser", "ner"],  # ORG entities, noun chunks
+    }
+
     def __init__(self):
         # Load small English model (installed via: python -m spacy download en_core_web_sm)
-        self.nlp = spacy.load("en_core_web_sm")
-        # Common stop terms in job postings beyond default stop words
-        self.extra_stop_terms = {
-            "experience",
-            "years",
-            "required",
-            "preferred",
-            "skills",
-            "knowledge",
-            "ability",
-            "responsibilities",
-            "duties",
-            "qualifications",
-            "requirements",
+        self.model_name = settings.SPACY_MODEL
+        # No extractor reads lemmas, so the lemmatizer is never loaded
+        self.nlp = spacy.load(self.model_name, exclude=["lemmatizer"])
+        self.disabled = {
+            extractor: [name for name in self.nlp.pipe_names if name not in components]
+            for extractor, components in self.EXTRACTOR_COMPONENTS.items()
         }
+        # Punctuation-only splitting keeps a "Requirements:" header with the bullet lines below it
+        self.sentencizer = Sentencizer()
+        # Patterns, stop terms, non-skill words and cleanup rules live in a versioned
+        # rule file, compiled once and reloaded when it changes
+        self.rule_loader = default_rules()
         # Technical skills gazetteer for simple string lookup augmentation
         self.technical_skills = {
             "python",
@@ -75,112 +93,85 @@ class SpaCyService:
             "slack",
             "figma",
         }
+        # Multi-word technical terms looked up after the single-term pass
+        self.multi_word_skills = [
+            "machine learning", "deep learning", "artificial intelligence", "data science",
+            "web development", "mobile development", "cloud computing", "devops",
+            "software engineering", "full stack", "front end", "back end",
+            "user experience", "user interface", "database management", "api development"
+        ]
+        # Compile the gazetteers once; an external taxonomy extends the built-in terms
+        if settings.SKILL_TAXONOMY_PATH:
+            self.skill_gazetteer = SkillGazetteer.from_file(settings.SKILL_TAXONOMY_PATH, self.technical_skills)
+        else:
+            self.skill_gazetteer = SkillGazetteer(self.technical_skills)
+        self.multi_word_gazetteer = SkillGazetteer(self.multi_word_skills)
+        # Matches and missing skills come from one vectorised comparison; it is model-free,
+        # so the API process uses the same class without loading spaCy (nlp_factory.create_skill_comparer)
+        self.skill_comparer = SkillComparer(threshold=settings.SKILL_MATCH_THRESHOLD)
 
     def extract_skills_from_text(self, text: str) -> List[str]:
         if not text:
             return []
-        
-        text_lower = text.lower()
+        return self._extract_skills(self._parse(text, "skills"))
+
+    def _parse(self, text: str, extractor: str) -> Doc:
+        """Run only the pipeline components ``extractor`` declared in EXTRACTOR_COMPONENTS"""
+        if len(self.disabled[extractor]) == len(self.nlp.pipe_names):
+            return self.nlp.make_doc(text)
+        return self.nlp(text, disable=self.disabled[extractor])
+
+    def _sentences(self, text: str) -> Doc:
+        return self.sentencizer(self.nlp.make_doc(text))
+
+    def _extract_skills(self, tokens: Union[Doc, Span]) -> List[str]:
+        """Skill extraction over an already parsed Doc or sentence Span"""
+        rules = self.rule_loader.current()
+        text = tokens.text
         skills_found = []
-        
-        # 1) First priority: Look for known technical skills in the text
-        for skill in self.technical_skills:
-            if skill in text_lower:
+        seen = set()
+
+        def add(skill: str) -> None:
+            if skill not in seen:
+                seen.add(skill)
                 skills_found.append(skill)
         
-        # 2) Look for skill patterns like "experience with X", "knowledge of Y", "proficient in Z"
-        skill_patterns = [
-            r"experience\s+(?:with|in)\s+([a-zA-Z0-9\s\+\#\.]+?)(?:\s|\.|,|$)",
-            r"knowledge\s+(?:of|in)\s+([a-zA-Z0-9\s\+\#\.]+?)(?:\s|\.|,|$)",
-            r"proficient\s+(?:with|in)\s+([a-zA-Z0-9\s\+\#\.]+?)(?:\s|\.|,|$)",
-            r"skilled\s+(?:with|in)\s+([a-zA-Z0-9\s\+\#\.]+?)(?:\s|\.|,|$)",
-            r"expertise\s+(?:with|in)\s+([a-zA-Z0-9\s\+\#\.]+?)(?:\s|\.|,|$)",
-            r"familiar\s+(?:with|in)\s+([a-zA-Z0-9\s\+\#\.]+?)(?:\s|\.|,|$)",
-        ]
+        # 1) First priority: Look for known technical skills in the text
+        for skill in self.skill_gazetteer.find_all(text):
+            add(skill)
         
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, text_lower)
-            for match in matches:
-                skill = match.strip()
-                if len(skill) > 2 and skill not in skills_found:
-                    skills_found.append(skill)
+        # 2) Skill patterns like "experience with X", "knowledge of Y", "proficient in Z" (one combined regex)
+        for skill in rules.pattern_skills(text.lower()):
+            if len(skill) > 2:
+                add(skill)
         
         # 3) Look for capitalized terms that might be technologies (e.g., React, Python, AWS)
-        doc = self.nlp(text)
-        for token in doc:
+        for token in tokens:
             if (token.is_title or token.is_upper) and len(token.text) > 2:
                 skill = token.text.lower()
                 # Only add if it looks like a real technology
-                if (skill not in skills_found and 
-                    skill not in self.extra_stop_terms):
-                    skills_found.append(skill)
+                if skill not in rules.stop_terms:
+                    add(skill)
         
         # 4) Look for multi-word technical terms (e.g., "machine learning", "deep learning")
-        text_lower = text.lower()
-        multi_word_skills = [
-            "machine learning", "deep learning", "artificial intelligence", "data science",
-            "web development", "mobile development", "cloud computing", "devops",
-            "software engineering", "full stack", "front end", "back end",
-            "user experience", "user interface", "database management", "api development"
-        ]
-        
-        for skill in multi_word_skills:
-            if skill in text_lower and skill not in skills_found:
-                skills_found.append(skill)
+        for skill in self.multi_word_gazetteer.find_all(text):
+            add(skill)
         
-        # 5) Filter out common non-skill words and clean up skills
+        # 5) Clean up candidates and drop non-skill words
         filtered_skills = []
-        non_skill_words = {
-            # English non-skill words
-            "experience", "years", "required", "preferred", "skills", "knowledge", 
-            "ability", "responsibilities", "duties", "qualifications", "requirements",
-            "team", "work", "project", "development", "software", "application",
-            "system", "technology", "platform", "framework", "library", "tool",
-            "methodology", "process", "approach", "strategy", "solution", "service",
-            "needed", "engineer", "scientist", "developer", "analyst", "manager",
-            "machine", "learning", "deep", "data", "analysis", "neural", "networks",
-            
-            # Turkish non-skill words
-            "görev", "tanımı", "şirketin", "için", "ile", "ve", "bu", "bir", "da", "de",
-            "gibi", "olarak", "üzerinde", "yazılım", "geliştirici", "deneyim", 
-            "konularında", "uzmanım", "arıyoruz", "gerekli", "şart", "yıl", "yıllık",
-            "pozisyon", "rol", "sorumluluk", "nitelik", "beceri", "yetenek", "bilgi",
-            "uygulama", "sistem", "teknoloji", "platform", "çerçeve", "kütüphane",
-            "araç", "metodoloji", "süreç", "yaklaşım", "strateji", "çözüm", "hizmet",
-            "mühendis", "geliştirici", "analist", "yönetici", "makine", "öğrenme",
-            "derin", "veri", "analiz", "sinir", "ağları", "deneyim", "yıllar",
-            "gerekli", "tercih", "yetenekler", "bilgi", "sorumluluk", "görevler",
-            "nitelikler", "gereksinimler", "takım", "iş", "proje", "geliştirme"
-        }
-        
         for skill in skills_found:
-            # Clean up the skill
-            skill = skill.strip().lower()
-            # Remove trailing punctuation and common words
-            skill = re.sub(r'[.,;!?]+$', '', skill)
-            skill = re.sub(r'\s+(required|needed|preferred|experience|years?)\s*$', '', skill)
-            
-            # Additional validation for real skills
-            is_real_skill = (
-                skill not in non_skill_words and 
-                len(skill) > 2 and 
-                len(skill.split()) <= 3 and  # Max 3 words per skill
-                not skill.endswith('.') and
-                not skill.isdigit() and  # Not just numbers
-                not any(char.isdigit() for char in skill) and  # No numbers in skill names
-                skill not in ['ve', 'ile', 'için', 'bu', 'bir', 'da', 'de', 'gibi', 'olarak']
-            )
-            
-            if is_real_skill:
+            skill = rules.clean(skill)
+            if rules.is_skill(skill):
                 filtered_skills.append(skill)
         
-        return filtered_skills[:10]  # Return top 10 most relevant skills
+        return filtered_skills[:rules.max_skills]  # Top skills, most relevant first
 
     def extract_job_info(self, text: str) -> Dict[str, str]:
         if not text:
             return {}
-        doc = self.nlp(text)
+        return self._extract_job_info(self._parse(text, "job_info"))
 
+    def _extract_job_info(self, doc: Doc) -> Dict[str, str]:
         # Company name: prefer ORG entities
         company = "Tech Company"
         for ent in doc.ents:
@@ -189,10 +180,10 @@ class SpaCyService:
                 break
 
         # Position title: heuristic - first title-like noun chunk or line containing common terms
-        position = self._guess_title(text)
+        position = self._guess_title(doc)
 
         # Experience: regex search
-        experience = self._extract_experience_requirement(text)
+        experience = self._extract_experience_requirement(doc.text)
 
         return {
             "position_title": position,
@@ -203,22 +194,16 @@ class SpaCyService:
     def extract_key_requirements(self, text: str) -> List[str]:
         if not text:
             return []
-        doc = self.nlp(text)
-        indicators = {
-            "required",
-            "preferred",
-            "must have",
-            "should have",
-            "need",
-            "requirements",
-            "qualifications",
-            "responsibilities",
-        }
+        return self._extract_key_requirements(self._sentences(text))
+
+    def _extract_key_requirements(self, doc: Doc) -> List[str]:
+        """Requirement skills from a Doc segmented by the sentencizer"""
+        indicators = self.rule_loader.current().requirement_indicators
         reqs: List[str] = []
         for sent in doc.sents:
             sent_lower = sent.text.lower()
             if any(ind in sent_lower for ind in indicators):
-                reqs.extend(self.extract_skills_from_text(sent.text))
+                reqs.extend(self._extract_skills(sent))
         # dedupe
         out, seen = [], set()
         for r in reqs:
@@ -227,74 +212,76 @@ class SpaCyService:
                 out.append(r)
         return out
 
+    @classmethod
+    def ruleset_version(cls) -> str:
+        """Code version plus the version of the rule file currently loaded"""
+        return f"{cls.RULESET_VERSION}+rules.{default_rules().version}"
+
+    def warm_up(self) -> None:
+        """Run one small posting through the pipeline so lazy model state is built now"""
+        self.analyze_posting(
+            "Senior Python Developer at Example Corp.\n"
+            "Required: 3+ years of experience with Python, Docker and machine learning."
+        )
+
     def analyze_cv_skills(self, cv_text: str) -> List[str]:
         return self.extract_skills_from_text(cv_text or "")
 
+    def analyze_cv(self, cv_text: str) -> CvAnalysis:
+        """CV skills stamped with the rule-set version this process used for them"""
+        version = self.ruleset_version()
+        skills = self.analyze_cv_skills(cv_text)
+        return CvAnalysis(skills=skills, ruleset_version=self._unchanged_version(version))
+
+    def _unchanged_version(self, version: str) -> str:
+        """``version`` if the rules did not reload during the analysis, else "" (not cacheable)"""
+        return version if self.ruleset_version() == version else ""
+
+    def analyze_posting(self, text: str) -> PostingAnalysis:
+        """Parse the posting once for job info and reuse that Doc for skills"""
+        if not text:
+            return PostingAnalysis()
+        return self._analyze_posting_doc(self._parse(text, "job_info"))
+
+    def analyze_postings(self, texts: List[str], batch_size: int = 64, n_process: int = 1) -> List[PostingAnalysis]:
+        """Batch variant of analyze_posting that streams the texts through nlp.pipe"""
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=self.disabled["job_info"])
+        return [self._analyze_posting_doc(doc) for doc in docs]
+
+    def _analyze_posting_doc(self, doc: Doc) -> PostingAnalysis:
+        if not doc.text:
+            return PostingAnalysis()
+        # Each process reloads rules on its own clock, so the result carries the version used here
+        version = self.ruleset_version()
+        skills = self._extract_skills(doc)
+        return PostingAnalysis(
+            job_info=self._extract_job_info(doc),
+            skills=skills,
+            # Re-tokenising is cheap next to the parser the sentencizer replaces
+            key_requirements=self._extract_key_requirements(self._sentences(doc.text)),
+            language=detect_language(doc.text, skills),
+            ruleset_version=self._unchanged_version(version),
+        )
+
+    def analyze_application(self, job_text: str, cv_text: str) -> ApplicationAnalysis:
+        """Full analysis stage for one request: one parse per document"""
+        return self.compare_skills(self.analyze_posting(job_text), self.analyze_cv_skills(cv_text))
+
+    def compare_skills(self, posting: PostingAnalysis, cv_skills: List[str]) -> ApplicationAnalysis:
+        """Match an analysed posting against CV skills; needs no parsing"""
+        return self.skill_comparer.compare_skills(posting, cv_skills)
+
     def match_skills(self, job_skills: List[str], cv_skills: List[str]) -> List[Dict]:
-        cv_set = {s.lower() for s in cv_skills}
-        matches: List[Dict] = []
-        
-        for js in job_skills:
-            j = js.lower()
-            
-            # Check for exact match first
-            if j in cv_set:
-                matches.append({
-                    "skill": js,
-                    "matched": True,
-                    "confidence": 1.0,
-                    "cv_evidence": "Exact match found in CV",
-                })
-                continue
-            
-            # Check for partial matches (e.g., "python" matches "python 3.9")
-            partial_match = False
-            best_match = ""
-            for cv_skill in cv_set:
-                if j in cv_skill or cv_skill in j:
-                    partial_match = True
-                    best_match = cv_skill
-                    break
-            
-            if partial_match:
-                matches.append({
-                    "skill": js,
-                    "matched": True,
-                    "confidence": 0.8,
-                    "cv_evidence": f"Partial match: {best_match}",
-                })
-            else:
-                matches.append({
-                    "skill": js,
-                    "matched": False,
-                    "confidence": 0.0,
-                    "cv_evidence": "Not found in CV",
-                })
-        
-        return matches
+        return self.skill_comparer.match_skills(job_skills, cv_skills)
 
     def find_missing_skills(self, job_skills: List[str], cv_skills: List[str]) -> List[str]:
-        cv_set = {s.lower() for s in cv_skills}
-        missing: List[str] = []
-        for js in job_skills:
-            j = js.lower()
-            if not (j in cv_set or any(j in s or s in j for s in cv_set)):
-                missing.append(js)
-        return missing
+        return self.skill_comparer.find_missing_skills(job_skills, cv_skills)
 
     def generate_recommendations(self, skill_matches: List[Dict], missing_skills: List[str]) -> List[str]:
-        recs: List[str] = []
-        matched_count = sum(1 for m in skill_matches if m["matched"])
-        total = len(skill_matches)
-        if total and matched_count < total * 0.5:
-            recs.append("Highlight your most relevant skills more prominently")
-        if missing_skills:
-            recs.append("Consider learning: " + ", ".join(missing_skills[:3]))
-        return recs
-
-    def _guess_title(self, text: str) -> str:
-        doc = self.nlp(text)
-        title_keywords = {"engineer", "developer", "scientist", "manager", "analyst", "lead", "architect"}
+        return self.skill_comparer.generate_recommendations(skill_matches, missing_skills)
+
+    def _guess_title(self, doc: Doc) -> str:
+        title_keywords = self.rule_loader.current().title_keywords
         for chunk in doc.noun_chunks:
             if any(k in chunk.text.lower() for k in title_keywords):
                 return chunk.text.strip()
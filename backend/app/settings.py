@@ -6,6 +6,87 @@ class Settings:
     OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
     AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", "1800"))
+    # Shared Ollama HTTP client: pool size, keep-alive and per-phase timeouts
+    OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "10"))
+    OLLAMA_MAX_KEEPALIVE = int(os.getenv("OLLAMA_MAX_KEEPALIVE", "10"))
+    OLLAMA_KEEPALIVE_EXPIRY = float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY", "30"))
+    OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+    OLLAMA_READ_TIMEOUT = float(os.getenv("OLLAMA_READ_TIMEOUT", "0"))  # 0 = AI_TIMEOUT
+    OLLAMA_POOL_TIMEOUT = float(os.getenv("OLLAMA_POOL_TIMEOUT", "60"))
+    # How long Ollama keeps the model loaded after a request
+    OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "10m")
+    # Evaluate the shared prompt prefix once and branch variants from its context
+    OLLAMA_PREFIX_REUSE = os.getenv("OLLAMA_PREFIX_REUSE", "false").lower() in ("1", "true", "yes")
+    # The model's chat template around {prompt}; prefix reuse sends raw prompts, so it is applied here
+    # (the default is Llama 3's; "\n" in the variable is read as a newline)
+    OLLAMA_PROMPT_TEMPLATE = os.getenv(
+        "OLLAMA_PROMPT_TEMPLATE",
+        "<|start_header_id|>user<|end_header_id|>\\n\\n{prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\\n\\n",
+    ).replace("\\n", "\n")
+    # LLM response cache (served only when a request sets reuse_cached)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+    LLM_CACHE_DISK_MAX_BYTES = int(os.getenv("LLM_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+    # LLM admission control: concurrent generations, queued waiters, max queue wait (0 = none)
+    LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "2"))
+    LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "16"))
+    LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "60"))
+    # Variants drafted at once per request, and the per-variant deadline (0 = none)
+    VARIANT_CONCURRENCY = int(os.getenv("VARIANT_CONCURRENCY", "3"))
+    VARIANT_TIMEOUT = float(os.getenv("VARIANT_TIMEOUT", "0"))
+    # Analysis engine: "spacy" (full model) or "nltk" (no model, low memory, offline)
+    NLP_ENGINE = os.getenv("NLP_ENGINE", "spacy")
+    SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+    # Local NLTK data for the nltk engine; nothing is downloaded at runtime
+    NLTK_DATA_DIR = os.getenv("NLTK_DATA_DIR", os.path.join(os.path.dirname(__file__), "data", "nltk_data"))
+    # Versioned skill-extraction rules; the file is re-read when it changes (0 = never)
+    EXTRACTION_RULES_PATH = os.getenv(
+        "EXTRACTION_RULES_PATH", os.path.join(os.path.dirname(__file__), "data", "extraction_rules.json")
+    )
+    EXTRACTION_RULES_RELOAD_INTERVAL = float(os.getenv("EXTRACTION_RULES_RELOAD_INTERVAL", "5"))
+    # One <language>.txt sample per language; the detector builds its trigram profiles from them
+    LANGUAGE_SAMPLES_DIR = os.getenv(
+        "LANGUAGE_SAMPLES_DIR", os.path.join(os.path.dirname(__file__), "data", "language_samples")
+    )
+    # Posterior the best language needs; below it (e.g. a bare list of technology names) DEFAULT_LANGUAGE is used
+    LANGUAGE_MIN_CONFIDENCE = float(os.getenv("LANGUAGE_MIN_CONFIDENCE", "0.99"))
+    # Template-provider letters as <language>/<tone>.txt files
+    LETTER_TEMPLATES_DIR = os.getenv(
+        "LETTER_TEMPLATES_DIR", os.path.join(os.path.dirname(__file__), "data", "letter_templates")
+    )
+    # SQLite file holding stored CVs and the skill -> CV inverted index (recruiter mode)
+    CV_INDEX_PATH = os.getenv("CV_INDEX_PATH", os.path.join(os.path.dirname(__file__), "data", "var", "cv_index.sqlite"))
+    # Minimum trigram cosine similarity for a fuzzy (non-exact) skill match
+    SKILL_MATCH_THRESHOLD = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.65"))
+    # Optional skill taxonomy file (one term per line) merged into the gazetteer
+    SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", "")
+    # PDF/DOCX export worker processes (0 = thread in the API process) and their queue bound
+    EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "1"))
+    EXPORT_MAX_PENDING = int(os.getenv("EXPORT_MAX_PENDING", "32"))
+    # Rendered PDF/DOCX cache keyed by letter content: in-memory LRU plus optional SQLite file
+    EXPORT_CACHE_ENABLED = os.getenv("EXPORT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    EXPORT_CACHE_TTL = float(os.getenv("EXPORT_CACHE_TTL", "86400"))
+    EXPORT_CACHE_PATH = os.getenv("EXPORT_CACHE_PATH", "")
+    EXPORT_CACHE_DISK_MAX_BYTES = int(os.getenv("EXPORT_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+    # /api/export-bulk: documents per request and documents rendering at once per request
+    EXPORT_BULK_MAX_DOCUMENTS = int(os.getenv("EXPORT_BULK_MAX_DOCUMENTS", "100"))
+    EXPORT_BULK_CONCURRENCY = int(os.getenv("EXPORT_BULK_CONCURRENCY", "4"))
+    # Analysis worker processes (0 = run on a thread in the API process)
+    NLP_WORKERS = int(os.getenv("NLP_WORKERS", "1"))
+    # Analyses allowed to wait for a worker before requests get a 503
+    NLP_MAX_PENDING = int(os.getenv("NLP_MAX_PENDING", "32"))
+    # Defaults for /api/analyze-batch (nlp.pipe) and postings allowed per analyze-batch/rank-jobs request
+    NLP_BATCH_MAX_DOCUMENTS = int(os.getenv("NLP_BATCH_MAX_DOCUMENTS", "500"))
+    NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "64"))
+    NLP_N_PROCESS = int(os.getenv("NLP_N_PROCESS", "1"))
+    # Posting/CV analysis cache: in-memory LRU plus optional SQLite file
+    ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "86400"))
+    ANALYSIS_CACHE_PATH = os.getenv("ANALYSIS_CACHE_PATH", "")
+    ANALYSIS_CACHE_DISK_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
 
 
 settings = Settings()
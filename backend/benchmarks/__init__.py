@@ -0,0 +1,3 @@
+"""
+Micro-benchmarks for the backend hot paths
+"""
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for /api/export-pdf and /api/export-docx.
+
+Requests go through the FastAPI app in-process (httpx ASGI transport), so
+the numbers cover validation, the export pool and response building but no
+network. ``--concurrency`` clients send requests back to back. The ``miss``
+run gives every request a different letter, so each one is rendered; the
+``hit`` run repeats one letter that is already in the export cache. The
+direct render rate of each format is measured as well for comparison:
+
+    python -m benchmarks.bench_export --workers 2 --concurrency 8 --requests 400
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from loadtest.load import EXPORT_BODY, percentile, varied_export_body
+
+from .bench_nlp import measure, parse_list
+
+
+_run_ids = itertools.count(1)
+
+
+async def endpoint_run(fmt: str, concurrency: int, requests: int, cached: bool) -> Dict[str, float]:
+    """Closed-loop run; ``cached`` repeats one primed letter, otherwise every letter is new"""
+    import httpx
+    from app.api.cover_letter import export_executor
+    from main import app
+
+    await export_executor.start()
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+    # Ids never repeat across runs of one process, so a miss run never hits an earlier entry
+    offset = next(_run_ids) * 1_000_000
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        for request_id in remaining:
+            body = varied_export_body(-1 if cached else offset + request_id)
+            started = time.perf_counter()
+            response = await client.post(f"/api/export-{fmt}", json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Warm each worker (and, for the cached run, the one entry) before the clock starts
+        await asyncio.gather(*(
+            client.post(f"/api/export-{fmt}", json=varied_export_body(-1 if cached else offset - 1 - i))
+            for i in range(concurrency)
+        ))
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "requests_per_sec": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def render_run(fmt: str, min_time: float) -> Dict[str, float]:
+    from app.services.document_export import RENDERERS
+    render = RENDERERS[fmt]
+    body = EXPORT_BODY
+    return measure(lambda: render(body["cover_letter"], body["position_title"], body["company_name"]), min_time, 100_000)
+
+
+def export_cache_enabled() -> bool:
+    from app.settings import settings
+    return settings.EXPORT_CACHE_ENABLED
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the PDF/DOCX export endpoints")
+    parser.add_argument("--formats", type=parse_list, default=["pdf", "docx"])
+    parser.add_argument("--workers", type=int, help="export worker processes (default: EXPORT_WORKERS)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per format")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds for each direct render measurement")
+    parser.add_argument("--no-cache", action="store_true", help="disable the export cache (no hit run)")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    # Read by app.settings, so they must be set before the app is imported
+    if args.workers is not None:
+        os.environ["EXPORT_WORKERS"] = str(args.workers)
+    if args.no_cache:
+        os.environ["EXPORT_CACHE_ENABLED"] = "false"
+
+    results = {}
+    for fmt in args.formats:
+        try:
+            results[f"export/render/{fmt}"] = render_run(fmt, args.min_time)
+        except ImportError as e:
+            print(f"Skipping {fmt}: {e}", file=sys.stderr)
+            continue
+        print(f"{fmt:5s} render   {results[f'export/render/{fmt}']['ops_per_sec']:>9.2f} docs/s", file=sys.stderr)
+        for mode in ("miss", "hit"):
+            if mode == "hit" and not export_cache_enabled():
+                continue
+            key = f"export/endpoint/{fmt}/{mode}"
+            results[key] = asyncio.run(endpoint_run(fmt, args.concurrency, args.requests, cached=mode == "hit"))
+            print(f"{fmt:5s} {mode:8s} {results[key]['requests_per_sec']:>9.2f} req/s "
+                  f"p50 {results[key]['p50_ms']:.1f} ms p95 {results[key]['p95_ms']:.1f} ms", file=sys.stderr)
+
+    print(json.dumps(results, indent=2, sort_keys=True))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for SpaCyService and NLPService extraction.
+
+Each operation runs against generated English and Turkish postings and CVs
+from 500 bytes to 1 MB. Throughput is measured with tracemalloc off; a
+separate traced call records allocations and peak memory. Results are
+compared against a stored baseline and the run fails when an operation got
+slower, or its peak memory grew, by more than the threshold:
+
+    python -m benchmarks.bench_nlp --update-baseline     # record this machine's baseline
+    python -m benchmarks.bench_nlp --threshold 0.2       # compare, exit 1 on regression
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from . import corpus
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_nlp.json")
+
+OPERATIONS = [
+    "extract_skills_from_text",
+    "extract_job_info",
+    "extract_key_requirements",
+    "match_skills",
+    "find_missing_skills",
+]
+
+
+def load_service(name: str):
+    if name == "spacy":
+        from app.services.spacy_service import SpaCyService
+        return SpaCyService()
+    if name == "nltk":
+        from app.services.nlp_service import NLPService
+        return NLPService()
+    raise ValueError(f"Unknown service: {name}")
+
+
+def operation_call(service, operation: str, posting: str, cv: str) -> Callable[[], object]:
+    """Zero-argument callable for one operation; skill lists are extracted up front"""
+    if operation in ("match_skills", "find_missing_skills"):
+        job_skills = service.extract_skills_from_text(posting)
+        cv_skills = service.extract_skills_from_text(cv)
+        method = getattr(service, operation)
+        return lambda: method(job_skills, cv_skills)
+    method = getattr(service, operation)
+    return lambda: method(posting)
+
+
+def measure(call: Callable[[], object], min_time: float, max_iterations: int) -> Dict[str, float]:
+    call()  # warm caches outside the measurement
+
+    iterations = 0
+    gc.collect()
+    started = time.perf_counter()
+    while True:
+        call()
+        iterations += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or iterations >= max_iterations:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline_current, _ = tracemalloc.get_traced_memory()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / elapsed, 3),
+        "mean_ms": round(elapsed / iterations * 1000, 3),
+        # Allocations still alive after the call (caches, interned strings, leaks)
+        "retained_blocks": sum(stat.count_diff for stat in diff if stat.count_diff > 0),
+        "retained_bytes": sum(stat.size_diff for stat in diff if stat.size_diff > 0),
+        "peak_bytes": peak - baseline_current,
+    }
+
+
+def run(
+    services: List[str],
+    operations: List[str],
+    languages: List[str],
+    sizes: List[int],
+    min_time: float,
+    max_iterations: int,
+) -> Dict[str, Dict[str, float]]:
+    texts = corpus.build(sizes, languages)
+    results: Dict[str, Dict[str, float]] = {}
+    for name in services:
+        try:
+            service = load_service(name)
+        except Exception as e:
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+            continue
+        for operation in operations:
+            for language in languages:
+                for size in sizes:
+                    key = f"{name}/{operation}/{language}/{size}"
+                    call = operation_call(service, operation, texts[(language, "posting", size)], texts[(language, "cv", size)])
+                    results[key] = measure(call, min_time, max_iterations)
+                    print(f"{key:60s} {results[key]['ops_per_sec']:>12.2f} ops/s "
+                          f"{results[key]['peak_bytes'] / 1024:>10.1f} KiB peak", file=sys.stderr)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """Human-readable regressions beyond ``threshold`` (a fraction, 0.2 = 20%)"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{key}: {current['ops_per_sec']:.2f} ops/s vs baseline {previous['ops_per_sec']:.2f}"
+            )
+        if previous["peak_bytes"] and current["peak_bytes"] > previous["peak_bytes"] * (1 + threshold):
+            regressions.append(
+                f"{key}: peak {current['peak_bytes']} bytes vs baseline {previous['peak_bytes']}"
+            )
+    return regressions
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the NLP extraction hot paths")
+    parser.add_argument("--services", type=parse_list, default=["spacy", "nltk"])
+    parser.add_argument("--operations", type=parse_list, default=OPERATIONS)
+    parser.add_argument("--languages", type=parse_list, default=["en", "tr"])
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in parse_list(v)], default=corpus.SIZES,
+                        help="corpus sizes in bytes")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to run each operation")
+    parser.add_argument("--max-iterations", type=int, default=10_000)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown/peak growth as a fraction")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.operations) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"Unknown operation(s): {', '.join(sorted(unknown))}")
+
+    results = run(args.services, args.operations, args.languages, args.sizes, args.min_time, args.max_iterations)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline updated: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
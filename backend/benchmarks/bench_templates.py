@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the template provider (TemplateRegistry).
+
+Each language/tone pair is measured twice: ``render`` fills prepared values,
+``letter`` also derives them from a job analysis as the API does. One
+``all-pairs`` operation writes one letter for every pair. Results are
+compared against a stored baseline like benchmarks.bench_nlp:
+
+    python -m benchmarks.bench_templates --update-baseline
+    python -m benchmarks.bench_templates --threshold 0.2
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Callable, Dict, List, Optional
+
+from .bench_nlp import compare, measure
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_templates.json")
+
+JOB_INFO = {"company_name": "Example Corp", "position_title": "Senior Python Developer"}
+CV_SKILLS = ["python", "django", "docker", "kubernetes", "postgresql", "aws", "react", "git"]
+SKILL_MATCHES = [
+    {"skill": skill, "matched": matched, "confidence": 1.0 if matched else 0.0, "cv_evidence": ""}
+    for skill, matched in [
+        ("python", True), ("docker", True), ("go", False), ("aws", True), ("kafka", False), ("postgresql", True),
+    ]
+]
+
+
+def load_registry(path: Optional[str]):
+    from app.services.letter_templates import TemplateRegistry
+    from app.settings import settings
+    return TemplateRegistry.from_directory(path or settings.LETTER_TEMPLATES_DIR)
+
+
+def letter_call(registry, language: str, tone: str) -> Callable[[], str]:
+    from app.services.letter_templates import letter_values
+    return lambda: registry.render(language, tone, letter_values({**JOB_INFO, "language": language}, CV_SKILLS, SKILL_MATCHES))
+
+
+def render_call(registry, language: str, tone: str) -> Callable[[], str]:
+    from app.services.letter_templates import letter_values
+    values = letter_values(JOB_INFO, CV_SKILLS, SKILL_MATCHES)
+    return lambda: registry.render(language, tone, values)
+
+
+def all_pairs_call(registry, pairs) -> Callable[[], List[str]]:
+    calls = [letter_call(registry, language, tone) for language, tone in pairs]
+    return lambda: [call() for call in calls]
+
+
+def run(template_dir: Optional[str], min_time: float, max_iterations: int) -> Dict[str, Dict[str, float]]:
+    registry = load_registry(template_dir)
+    pairs = sorted(registry.templates)
+    results: Dict[str, Dict[str, float]] = {}
+    cases = [(f"templates/{kind}/{language}/{tone}", factory(registry, language, tone))
+             for language, tone in pairs
+             for kind, factory in (("render", render_call), ("letter", letter_call))]
+    cases.append(("templates/letter/all-pairs", all_pairs_call(registry, pairs)))
+    for key, call in cases:
+        results[key] = measure(call, min_time, max_iterations)
+        print(f"{key:45s} {results[key]['ops_per_sec']:>14.2f} ops/s "
+              f"{results[key]['peak_bytes'] / 1024:>8.1f} KiB peak", file=sys.stderr)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the template cover letter provider")
+    parser.add_argument("--templates", help="template directory (default: LETTER_TEMPLATES_DIR)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to run each case")
+    parser.add_argument("--max-iterations", type=int, default=1_000_000)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown/peak growth as a fraction")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.templates, args.min_time, args.max_iterations)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline updated: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
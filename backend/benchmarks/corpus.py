@@ -0,0 +1,97 @@
+"""
+Deterministic English and Turkish postings and CVs of a requested size
+"""
+
+import random
+from typing import Dict, List
+
+SIZES = [500, 10_000, 100_000, 1_000_000]
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "React", "Angular", "Django", "FastAPI",
+    "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes", "AWS", "Azure", "Terraform",
+    "machine learning", "deep learning", "TensorFlow", "PyTorch", "Git", "Jira", "REST API",
+    "GraphQL", "CI/CD", "Node.js", "C++", "C#", "Go", "Rust", "scikit-learn", "NLP",
+]
+
+TEMPLATES: Dict[str, Dict[str, List[str]]] = {
+    "en": {
+        "posting_header": [
+            "Senior Software Engineer\nAcme Technologies Inc.\nIstanbul, Turkey\n",
+        ],
+        "posting": [
+            "We are looking for an engineer with {n}+ years of experience in {a} and {b}.",
+            "Required: strong knowledge of {a}, {b} and {c}.",
+            "Experience with {a} is preferred; familiarity with {b} is a plus.",
+            "The candidate should have hands-on experience building services with {a}.",
+            "You will design, build and operate systems using {a} and {b} on {c}.",
+            "Qualifications include a degree in computer science and {n} years in {a}.",
+            "Our team values clean code, code review and automated testing with {a}.",
+        ],
+        "cv_header": [
+            "Jane Doe\nSoftware Developer\njane.doe@example.com\n",
+        ],
+        "cv": [
+            "Built and maintained {a} services for {n} years, deploying with {b}.",
+            "Led a team of {n} developers migrating a monolith to {a} and {b}.",
+            "Skills: {a}, {b}, {c}.",
+            "Designed data pipelines with {a} and reduced costs by {n}0 percent.",
+            "Mentored junior engineers on {a} best practices and {b}.",
+        ],
+    },
+    "tr": {
+        "posting_header": [
+            "Kıdemli Yazılım Mühendisi\nAcme Teknoloji A.Ş.\nİstanbul, Türkiye\n",
+        ],
+        "posting": [
+            "{a} ve {b} konusunda en az {n} yıl deneyimli bir mühendis arıyoruz.",
+            "Gereksinimler: {a}, {b} ve {c} bilgisi.",
+            "{a} deneyimi tercih sebebidir; {b} bilgisi artı olarak değerlendirilecektir.",
+            "Adayın {a} ile servis geliştirme konusunda tecrübesi olmalıdır.",
+            "{c} üzerinde {a} ve {b} kullanarak sistemler tasarlayacaksınız.",
+            "Bilgisayar mühendisliği mezunu ve {a} alanında {n} yıl deneyim.",
+            "Ekibimiz temiz kod, kod incelemesi ve {a} ile otomatik teste önem verir.",
+        ],
+        "cv_header": [
+            "Ayşe Yılmaz\nYazılım Geliştirici\nayse.yilmaz@example.com\n",
+        ],
+        "cv": [
+            "{n} yıl boyunca {a} servisleri geliştirdim ve {b} ile dağıttım.",
+            "{n} kişilik bir ekibe liderlik ederek monoliti {a} ve {b} mimarisine taşıdım.",
+            "Yetenekler: {a}, {b}, {c}.",
+            "{a} ile veri hatları tasarladım ve maliyetleri yüzde {n}0 azalttım.",
+            "Genç mühendislere {a} ve {b} konusunda mentorluk yaptım.",
+        ],
+    },
+}
+
+
+def generate(language: str, kind: str, size: int, seed: int = 0) -> str:
+    """Text of at most ``size`` UTF-8 bytes (and close to it) for a posting or CV"""
+    rng = random.Random(f"{language}-{kind}-{size}-{seed}")
+    templates = TEMPLATES[language]
+    parts = [rng.choice(templates[f"{kind}_header"])]
+    used = len(parts[0].encode("utf-8"))
+    while True:
+        sentence = rng.choice(templates[kind]).format(
+            a=rng.choice(SKILLS), b=rng.choice(SKILLS), c=rng.choice(SKILLS), n=rng.randint(2, 9)
+        )
+        # Start a new paragraph now and then so line-based extractors see structure
+        separator = "" if len(parts) == 1 else "\n" if rng.random() < 0.2 else " "
+        chunk = separator + sentence
+        chunk_size = len(chunk.encode("utf-8"))
+        if used + chunk_size > size:
+            break
+        parts.append(chunk)
+        used += chunk_size
+    return "".join(parts)
+
+
+def build(sizes: List[int], languages: List[str], seed: int = 0) -> Dict[tuple, str]:
+    """Corpus keyed by (language, kind, size)"""
+    return {
+        (language, kind, size): generate(language, kind, size, seed)
+        for language in languages
+        for kind in ("posting", "cv")
+        for size in sizes
+    }
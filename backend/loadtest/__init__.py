@@ -0,0 +1,3 @@
+"""
+Load-testing tools: a fake Ollama server and an async load generator
+"""
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Stand-in for Ollama's /api/generate with configurable latency and token rate.
+
+It follows Ollama where the backend depends on it: prompts are wrapped in the
+model's chat template unless ``raw`` is set, a ``context`` is continued
+rather than replaced, the returned context holds the prompt and the response,
+and ``num_predict`` only limits the response when it is above 0. Prompts are
+tokenised by character and responses by word, and ``app.state.decode`` turns
+a context back into the exact text; every text the model saw is kept in
+``app.state.prompts``.
+
+Run it and point the backend at it:
+
+    python -m loadtest.fake_ollama --port 11435 --latency 0.3 --tokens-per-second 40
+    OLLAMA_BASE_URL=http://localhost:11435 uvicorn main:app --port 8003
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LOREM = (
+    "I am writing to express my strong interest in the position. My experience with Python, "
+    "FastAPI and cloud platforms has prepared me to contribute from day one, and I would "
+    "welcome the chance to discuss how my background fits your team."
+).split()
+
+
+@dataclass
+class FakeOllamaConfig:
+    latency: float = 0.2              # seconds before the first token (prompt evaluation)
+    jitter: float = 0.0               # +/- seconds added uniformly to latency
+    tokens_per_second: float = 50.0   # 0 = emit every token immediately
+    tokens: int = 120                 # tokens per response, capped by num_predict
+    error_rate: float = 0.0           # fraction of requests answered with HTTP 500
+    model: str = "llama3.1:8b"
+    template: str = (                 # Llama 3's chat template, as Ollama applies it
+        "<|start_header_id|>user<|end_header_id|>\n\n{prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"
+    )
+
+
+def create_app(config: FakeOllamaConfig) -> FastAPI:
+    app = FastAPI(title="Fake Ollama")
+    app.state.prompts = []
+    vocabulary: dict = {}
+    pieces: list = []
+
+    def encode(tokens) -> list:
+        ids = []
+        for token in tokens:
+            if token not in vocabulary:
+                vocabulary[token] = len(pieces)
+                pieces.append(token)
+            ids.append(vocabulary[token])
+        return ids
+
+    def decode(context) -> str:
+        return "".join(pieces[i] for i in context)
+
+    app.state.decode = decode
+
+    def response_tokens(body: dict) -> list:
+        # Like Ollama's runner, the limit only applies when num_predict > 0
+        limit = body.get("options", {}).get("num_predict")
+        count = min(config.tokens, limit) if limit is not None and limit > 0 else config.tokens
+        return [LOREM[i % len(LOREM)] + " " for i in range(count)]
+
+    def model_input(body: dict) -> list:
+        """Token ids the model has seen: the context, then the (templated) prompt"""
+        prompt = body.get("prompt", "")
+        if not body.get("raw"):
+            prompt = config.template.replace("{prompt}", prompt)
+        ids = list(body.get("context") or []) + encode(prompt)
+        app.state.prompts.append(decode(ids))
+        return ids
+
+    def final_stats(body: dict, seen: list, tokens: list, started: float, first_token: float) -> dict:
+        now = time.perf_counter()
+        prompt_tokens = len(body.get("prompt", "").split())
+        return {
+            "model": body.get("model", config.model),
+            "done": True,
+            "context": seen + encode(tokens),
+            "total_duration": int((now - started) * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int((first_token - started) * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": int((now - first_token) * 1e9),
+        }
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": config.model}]}
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        started = time.perf_counter()
+        if config.error_rate and random.random() < config.error_rate:
+            return JSONResponse({"error": "fake failure"}, status_code=500)
+
+        seen = model_input(body)
+        await asyncio.sleep(max(0.0, config.latency + random.uniform(-config.jitter, config.jitter)))
+        first_token = time.perf_counter()
+        tokens = response_tokens(body)
+        delay = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+        if body.get("stream", True):
+            async def chunks():
+                for token in tokens:
+                    if delay:
+                        await asyncio.sleep(delay)
+                    yield json.dumps({"model": body.get("model", config.model), "response": token, "done": False}) + "\n"
+                yield json.dumps({"response": "", **final_stats(body, seen, tokens, started, first_token)}) + "\n"
+
+            return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+        if delay:
+            await asyncio.sleep(delay * len(tokens))
+        return {"response": "".join(tokens).strip(), **final_stats(body, seen, tokens, started, first_token)}
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Ollama server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform +/- seconds on latency")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="0 = no delay between tokens")
+    parser.add_argument("--tokens", type=int, default=120, help="tokens per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail with 500")
+    args = parser.parse_args()
+
+    config = FakeOllamaConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second,
+        tokens=args.tokens,
+        error_rate=args.error_rate,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
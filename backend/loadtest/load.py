@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generator for the cover letter API.
+
+Requests are started on a fixed schedule (target RPS) regardless of how fast
+earlier ones finish, so queueing in the server shows up as latency instead of
+silently lowering the offered load. By default every generate and export
+request carries a different posting, CV and letter, so the server's analysis
+and export caches see misses as real traffic would; ``--bodies fixed`` sends
+one body throughout to measure the cached path. Results are printed as JSON:
+
+    python -m loadtest.load --base-url http://localhost:8003 --rps 5 --duration 30 \\
+        --mix generate=2,export-pdf=1,extract-cv-text=1 --output run.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+DEFAULT_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_cv.pdf")
+
+GENERATE_BODY = {
+    "job_posting": {
+        "job_posting_text": (
+            "Senior Software Engineer - Python/FastAPI. We are seeking an engineer with 3+ years "
+            "of Python, FastAPI, React, Docker and AWS experience. Knowledge of machine learning is a plus."
+        )
+    },
+    "cv_data": {
+        "cv_text": (
+            "Software developer with 4 years of experience in Python, FastAPI, React and PostgreSQL. "
+            "Built REST APIs, deployed services with Docker on AWS."
+        )
+    },
+    "company_name": "TechCorp",
+    "position_title": "Senior Software Engineer",
+    "tone": "formal",
+    "variants": 1,
+}
+
+EXPORT_BODY = {
+    "cover_letter": "Dear Hiring Manager,\n\n" + "I am excited to apply for this role. " * 40 + "\n\nSincerely,\nApplicant",
+    "position_title": "Senior Software Engineer",
+    "company_name": "TechCorp",
+}
+
+# Skills drawn into varied bodies, so postings and CVs differ in content and not only in a suffix
+SKILLS = [
+    "Python", "FastAPI", "Django", "React", "TypeScript", "Docker", "Kubernetes", "AWS", "GCP", "PostgreSQL",
+    "Redis", "Kafka", "Go", "Java", "Terraform", "GraphQL", "machine learning", "CI/CD", "Linux", "MongoDB",
+]
+
+BODY_MODES = ("varied", "fixed")
+
+
+def varied_generate_body(request_id: int, rng: random.Random, variants: int) -> dict:
+    """A generate body no earlier request of the run has sent"""
+    posting_skills = rng.sample(SKILLS, 5)
+    cv_skills = rng.sample(SKILLS, 4)
+    years = rng.randint(1, 8)
+    return {
+        **GENERATE_BODY,
+        "job_posting": {
+            "job_posting_text": (
+                f"Software Engineer (ref {request_id}). We are seeking an engineer with {years}+ years "
+                f"of {', '.join(posting_skills[:-1])} and {posting_skills[-1]} experience."
+            )
+        },
+        "cv_data": {
+            "cv_text": (
+                f"Software developer (candidate {request_id}) with {years + rng.randint(-1, 2)} years of experience "
+                f"in {', '.join(cv_skills)}. Built and deployed production services."
+            )
+        },
+        "variants": variants,
+    }
+
+
+def varied_export_body(request_id: int) -> dict:
+    """EXPORT_BODY with a per-request line, so every export is rendered"""
+    return {**EXPORT_BODY, "cover_letter": f"{EXPORT_BODY['cover_letter']}\n\nReference: {request_id}"}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LoadRun:
+    def __init__(self, base_url: str, pdf_bytes: bytes, timeout: float, variants: int, bodies: str = "varied",
+                 seed: Optional[int] = None):
+        self.base_url = base_url.rstrip("/")
+        self.pdf_bytes = pdf_bytes
+        self.timeout = timeout
+        self.variants = variants
+        self.bodies = bodies
+        self.generate_body = {**GENERATE_BODY, "variants": variants}
+        self._rng = random.Random(seed)
+        self._request_ids = itertools.count(1)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: Dict[str, int] = Counter()
+        self.dropped = 0
+
+    def body(self, scenario: str) -> dict:
+        if self.bodies == "fixed":
+            return self.generate_body if scenario == "generate" else EXPORT_BODY
+        request_id = next(self._request_ids)
+        if scenario == "generate":
+            return varied_generate_body(request_id, self._rng, self.variants)
+        return varied_export_body(request_id)
+
+    async def send(self, client: httpx.AsyncClient, scenario: str) -> None:
+        started = time.perf_counter()
+        try:
+            if scenario == "generate":
+                response = await client.post("/api/generate-cover-letter", json=self.body(scenario))
+            elif scenario == "export-pdf":
+                response = await client.post("/api/export-pdf", json=self.body(scenario))
+            elif scenario == "extract-cv-text":
+                files = {"file": ("cv.pdf", self.pdf_bytes, "application/pdf")}
+                response = await client.post("/api/extract-cv-text", files=files)
+            else:
+                raise ValueError(f"Unknown scenario: {scenario}")
+            await response.aread()
+            status = str(response.status_code)
+            failed = response.status_code >= 400
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+            failed = True
+        self.latencies[scenario].append(time.perf_counter() - started)
+        self.statuses[scenario][status] += 1
+        if failed:
+            self.errors[scenario] += 1
+
+    async def run(self, rps: float, duration: float, mix: Dict[str, float], max_in_flight: int) -> dict:
+        scenarios = list(mix)
+        weights = [mix[name] for name in scenarios]
+        limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+        interval = 1.0 / rps
+        pending = set()
+
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            started = time.perf_counter()
+            sent = 0
+            while True:
+                due = started + sent * interval
+                if due - started >= duration:
+                    break
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                sent += 1
+                if len(pending) >= max_in_flight:
+                    # Client-side cap reached; count it rather than delaying the schedule
+                    self.dropped += 1
+                    continue
+                scenario = random.choices(scenarios, weights)[0]
+                task = asyncio.create_task(self.send(client, scenario))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+            elapsed = time.perf_counter() - started
+
+        return self.report(rps, duration, elapsed, sent)
+
+    def report(self, rps: float, duration: float, elapsed: float, sent: int) -> dict:
+        endpoints = {}
+        for scenario, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            count = len(values)
+            errors = self.errors[scenario]
+            endpoints[scenario] = {
+                "requests": count,
+                "errors": errors,
+                "error_rate": round(errors / count, 4) if count else 0.0,
+                "throughput_rps": round((count - errors) / elapsed, 3) if elapsed else 0.0,
+                "status_codes": dict(self.statuses[scenario]),
+                "latency_ms": {
+                    "mean": round(sum(values) / count * 1000, 2) if count else 0.0,
+                    "p50": round(percentile(values, 50) * 1000, 2),
+                    "p90": round(percentile(values, 90) * 1000, 2),
+                    "p95": round(percentile(values, 95) * 1000, 2),
+                    "p99": round(percentile(values, 99) * 1000, 2),
+                    "max": round(values[-1] * 1000, 2) if count else 0.0,
+                },
+            }
+        completed = sum(len(values) for values in self.latencies.values())
+        errors = sum(self.errors.values())
+        return {
+            "base_url": self.base_url,
+            "bodies": self.bodies,
+            "target_rps": rps,
+            "duration_seconds": duration,
+            "elapsed_seconds": round(elapsed, 3),
+            "scheduled": sent,
+            "dropped": self.dropped,
+            "completed": completed,
+            "errors": errors,
+            "error_rate": round(errors / completed, 4) if completed else 0.0,
+            "throughput_rps": round((completed - errors) / elapsed, 3) if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    unknown = set(mix) - {"generate", "export-pdf", "extract-cv-text"}
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+    return mix
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Drive the cover letter API at a target request rate")
+    parser.add_argument("--base-url", default="http://localhost:8003")
+    parser.add_argument("--rps", type=float, default=2.0, help="requests started per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep sending")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("generate=1,export-pdf=1,extract-cv-text=1"),
+                        help="weighted scenarios, e.g. generate=2,export-pdf=1")
+    parser.add_argument("--variants", type=int, default=1, help="variants per generate request")
+    parser.add_argument("--bodies", choices=BODY_MODES, default="varied",
+                        help="varied: a new posting/CV/letter per request (cache misses); fixed: one body (cache hits)")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="client-side cap on open requests")
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-request timeout in seconds")
+    parser.add_argument("--pdf", default=DEFAULT_PDF, help="PDF uploaded by extract-cv-text")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for the scenario mix and varied bodies")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    with open(args.pdf, "rb") as f:
+        pdf_bytes = f.read()
+
+    load = LoadRun(args.base_url, pdf_bytes, args.timeout, args.variants, args.bodies, args.seed)
+    result = asyncio.run(load.run(args.rps, args.duration, args.mix, args.max_in_flight))
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
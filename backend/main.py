@@ -1,13 +1,47 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from app.api.cover_letter import router as cover_letter_router
+from app.api.cover_letter import (
+    router as cover_letter_router,
+    analysis_executor,
+    export_executor,
+    export_cache,
+    analysis_cache,
+    ai_service,
+    readiness,
+    warm_up,
+    close_cv_index,
+)
 import uvicorn
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop the shared worker pools and clients with the app"""
+    # The model loads in the background so the server accepts connections right away;
+    # /ready reports when it has finished
+    warm_up_task = asyncio.create_task(warm_up())
+    if ai_service:
+        await ai_service.start()
+    yield
+    warm_up_task.cancel()
+    if ai_service:
+        await ai_service.aclose()
+    analysis_executor.shutdown()
+    export_executor.shutdown()
+    if export_cache:
+        export_cache.close()
+    analysis_cache.close()
+    close_cv_index()
+
+
 app = FastAPI(
     title="AI Cover Letter Generator API",
     description="An intelligent API for generating personalized cover letters",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -22,6 +56,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the frontend read export ETags and send them back as If-None-Match
+    expose_headers=["ETag"],
 )
 
 # Include routers
@@ -41,6 +77,14 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "cover-letter-generator"}
 
+@app.get("/ready")
+async def ready_check():
+    """Readiness probe: 503 until the NLP model is loaded and warmed up"""
+    state = readiness.stats()
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content={"status": "starting", **state})
+    return {"status": "ready", **state}
+
 @app.get("/api/status")
 async def api_status():
     """API status endpoint"""
@@ -48,8 +92,16 @@ async def api_status():
         "status": "operational",
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
             "generate": "/api/generate-cover-letter",
-            "analyze": "/api/analyze-job-posting"
+            "generate_stream": "/api/generate-cover-letter/stream",
+            "analyze": "/api/analyze-job-posting",
+            "analyze_batch": "/api/analyze-batch",
+            "rank_jobs": "/api/rank-jobs",
+            "add_cv": "/api/cvs",
+            "rank_cvs": "/api/rank-cvs",
+            "export_bulk": "/api/export-bulk",
+            "metrics": "/api/metrics"
         }
     }
 
@@ -0,0 +1,56 @@
+"""
+Analyses are cached under the rule-set version the analysing worker used
+"""
+
+import asyncio
+
+from app.services.analysis import CvAnalysis, PostingAnalysis
+from app.services.analysis_cache import AnalysisCache
+from app.services.cache import TieredCache
+
+TEXT = "Senior Python Developer. Required: Python and Docker."
+
+
+def make_cache(api_version):
+    return AnalysisCache(TieredCache.from_settings(1024 * 1024, 0, "", 0), "model", lambda: api_version[0])
+
+
+def test_worker_on_old_rules_does_not_fill_the_new_key():
+    # The API process has reloaded the rule file; the worker has not yet
+    api_version = ["rules.2"]
+    cache = make_cache(api_version)
+    stale = PostingAnalysis(skills=["python"], ruleset_version="rules.1")
+
+    async def run():
+        await cache.set_posting(TEXT, stale)
+        missed = await cache.get_posting(TEXT)
+        api_version[0] = "rules.1"
+        hit = await cache.get_posting(TEXT)
+        return missed, hit
+
+    missed, hit = asyncio.run(run())
+    assert missed is None
+    assert hit == stale
+
+
+def test_results_without_a_version_are_not_cached():
+    api_version = ["rules.1"]
+    cache = make_cache(api_version)
+
+    async def run():
+        await cache.set_posting(TEXT, PostingAnalysis(skills=["python"]))
+        await cache.set_cv(TEXT, CvAnalysis(skills=["python"]))
+        return await cache.get_posting(TEXT), await cache.get_cv(TEXT)
+
+    assert asyncio.run(run()) == (None, None)
+
+
+def test_cv_hits_report_the_version_they_were_stored_under():
+    api_version = ["rules.1"]
+    cache = make_cache(api_version)
+
+    async def run():
+        await cache.set_cv(TEXT, CvAnalysis(skills=["python"], ruleset_version="rules.1"))
+        return await cache.get_cv(TEXT)
+
+    assert asyncio.run(run()) == CvAnalysis(skills=["python"], ruleset_version="rules.1")
@@ -0,0 +1,41 @@
+"""
+Batch endpoints refuse more than NLP_BATCH_MAX_DOCUMENTS postings before analysing any
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import cover_letter
+from app.models.schemas import BatchAnalysisRequest, CVRequest, JobPostingRequest, RankJobsRequest
+
+
+def _postings(count):
+    return [JobPostingRequest(job_posting_text=f"Python developer {i}") for i in range(count)]
+
+
+def _refuse_analysis(monkeypatch):
+    async def fail(*args):
+        raise AssertionError("postings were analysed")
+
+    monkeypatch.setattr(cover_letter, "_analyze_postings", fail)
+
+
+def test_analyze_batch_rejects_too_many_postings(monkeypatch):
+    monkeypatch.setattr(cover_letter.settings, "NLP_BATCH_MAX_DOCUMENTS", 2)
+    _refuse_analysis(monkeypatch)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(cover_letter.analyze_batch(BatchAnalysisRequest(job_postings=_postings(3))))
+    assert error.value.status_code == 400
+
+
+def test_rank_jobs_rejects_too_many_postings(monkeypatch):
+    monkeypatch.setattr(cover_letter.settings, "NLP_BATCH_MAX_DOCUMENTS", 2)
+    _refuse_analysis(monkeypatch)
+    request = RankJobsRequest(cv_data=CVRequest(cv_text="Python engineer"), job_postings=_postings(3))
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(cover_letter.rank_jobs(request))
+    assert error.value.status_code == 400
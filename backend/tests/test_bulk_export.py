@@ -0,0 +1,44 @@
+"""
+/api/export-bulk must not hold more than EXPORT_BULK_CONCURRENCY rendered documents at once
+"""
+
+import asyncio
+import io
+import zipfile
+
+from app.api import cover_letter
+from app.models.schemas import ExportRequest
+
+
+def test_slow_client_holds_at_most_concurrency_rendered_documents(monkeypatch):
+    limit = 3
+    monkeypatch.setattr(cover_letter.settings, "EXPORT_BULK_CONCURRENCY", limit)
+    documents = [
+        ExportRequest(cover_letter=f"Letter {i}", company_name="Acme", position_title="Dev") for i in range(20)
+    ]
+    state = {"rendered": 0, "sent": 0, "max_held": 0}
+
+    async def fake_render(fmt, document):
+        await asyncio.sleep(0)
+        state["rendered"] += 1
+        # Rendered but not yet handed to the client
+        state["max_held"] = max(state["max_held"], state["rendered"] - state["sent"])
+        return f"%PDF {document.cover_letter}".encode()
+
+    monkeypatch.setattr(cover_letter, "_render_export", fake_render)
+
+    async def consume_slowly():
+        chunks = []
+        async for chunk in cover_letter._bulk_export_chunks(documents, "pdf"):
+            chunks.append(chunk)
+            # Renders that finished during the previous chunk's send are still held here
+            await asyncio.sleep(0.01)
+            if len(chunks) <= len(documents):
+                state["sent"] += 1
+        return b"".join(chunks)
+
+    archive = zipfile.ZipFile(io.BytesIO(asyncio.run(consume_slowly())))
+
+    assert len(archive.namelist()) == len(documents)
+    assert state["rendered"] == len(documents)
+    assert state["max_held"] <= limit
@@ -0,0 +1,25 @@
+"""
+CVs indexed under another rule-set version are flagged as stale when ranked
+"""
+
+from app.api import cover_letter
+from app.services.cv_index import CvIndex
+
+
+def test_rank_cvs_flags_rows_from_another_ruleset_version(tmp_path, monkeypatch):
+    index = CvIndex(str(tmp_path / "cv_index.sqlite"))
+    monkeypatch.setattr(cover_letter, "cv_index", index)
+    index.add("current", ["python", "docker"], "v2", name="Current")
+    index.add("old", ["python"], "v1", name="Old")
+
+    response = cover_letter._rank_cvs(cover_letter.skill_comparer, ["python", "docker"], 10, "v2")
+
+    stale = {result.cv_id: result.stale for result in response.results}
+    assert stale == {"current": False, "old": True}
+    assert response.stale_candidates == 1
+    assert index.stats("v2")["stale"] == 1
+
+    # Adding the CV again under the current version refreshes it
+    index.add("old", ["python"], "v2", name="Old")
+    assert cover_letter._rank_cvs(cover_letter.skill_comparer, ["python"], 10, "v2").stale_candidates == 0
+    index.close()
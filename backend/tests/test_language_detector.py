@@ -0,0 +1,36 @@
+"""
+Short, technology-heavy postings must not be attributed to another language
+"""
+
+import pytest
+
+from app.services.language_detector import DEFAULT_LANGUAGE, default_detector, detect_language
+
+
+@pytest.mark.parametrize("text", [
+    "ML Engineer - PyTorch, TensorFlow, MLOps, Kubeflow, SageMaker",
+    "Python, Django, Docker, Kubernetes, AWS, PostgreSQL, React",
+    "python, django, docker, kubernetes, aws, postgresql, react, redis, kafka",
+    "Senior Backend Engineer. Python, Go, Kafka, gRPC",
+    "DevOps: Terraform, Ansible, Jenkins, GitLab CI, Prometheus, Grafana",
+    "Data Engineer (Spark, Airflow, Snowflake, dbt, BigQuery)",
+])
+def test_tech_only_postings_fall_back_to_the_default_language(text):
+    assert detect_language(text) == DEFAULT_LANGUAGE
+
+
+def test_skill_words_are_ignored():
+    text = "pytorch tensorflow kubeflow sagemaker mlops airflow snowflake bigquery"
+    skills = ["pytorch", "tensorflow", "kubeflow", "sagemaker", "mlops", "airflow", "snowflake", "bigquery"]
+    assert default_detector().detect(text, skills).confidence == 0.0
+
+
+@pytest.mark.parametrize("language, text", [
+    ("en", "We are looking for a software engineer with Python and Docker experience."),
+    ("de", "Wir suchen einen Softwareentwickler mit Erfahrung in Python und Docker."),
+    ("tr", "Python ve Docker deneyimi olan bir yazılım geliştirici arıyoruz."),
+    ("fr", "Nous recherchons un développeur Python avec une expérience Docker."),
+    ("es", "Buscamos un desarrollador Python con experiencia en Docker."),
+])
+def test_short_postings_in_a_language_are_still_detected(language, text):
+    assert detect_language(text, ["python", "docker"]) == language
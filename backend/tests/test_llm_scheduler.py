@@ -0,0 +1,119 @@
+"""
+LlmScheduler admission: priority and FIFO order, rejection, queue timeout and hand-off
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.llm_scheduler import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    LlmScheduler,
+    SchedulerOverloaded,
+)
+
+
+async def _settle():
+    # Let queued waiters run up to their await
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _serve_in_order(scheduler, waiters):
+    """Queue (name, priority) waiters behind one held slot; return the order they were served"""
+    served = []
+
+    async def waiter(name, priority):
+        await scheduler.acquire(priority)
+        served.append(name)
+        scheduler.release()
+
+    await scheduler.acquire()
+    tasks = []
+    for name, priority in waiters:
+        tasks.append(asyncio.create_task(waiter(name, priority)))
+        await _settle()
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    return served
+
+
+def test_higher_priority_waiters_are_served_first():
+    scheduler = LlmScheduler(max_in_flight=1, max_queue=10)
+    served = asyncio.run(_serve_in_order(scheduler, [
+        ("batch", PRIORITY_BATCH),
+        ("interactive", PRIORITY_INTERACTIVE),
+    ]))
+    assert served == ["interactive", "batch"]
+    assert scheduler.in_flight == 0
+
+
+def test_waiters_of_one_priority_are_served_in_arrival_order():
+    scheduler = LlmScheduler(max_in_flight=1, max_queue=10)
+    served = asyncio.run(_serve_in_order(scheduler, [
+        ("b1", PRIORITY_BATCH),
+        ("i1", PRIORITY_INTERACTIVE),
+        ("b2", PRIORITY_BATCH),
+        ("i2", PRIORITY_INTERACTIVE),
+        ("b3", PRIORITY_BATCH),
+    ]))
+    assert served == ["i1", "i2", "b1", "b2", "b3"]
+
+
+def test_full_queue_rejects_immediately():
+    scheduler = LlmScheduler(max_in_flight=1, max_queue=1)
+
+    async def scenario():
+        await scheduler.acquire()
+        queued = asyncio.create_task(scheduler.acquire())
+        await _settle()
+        with pytest.raises(SchedulerOverloaded) as error:
+            await scheduler.acquire()
+        assert error.value.retry_after >= 1
+        scheduler.release()
+        await queued
+        scheduler.release()
+
+    asyncio.run(scenario())
+    assert scheduler.rejected == 1
+    assert scheduler.in_flight == 0
+
+
+def test_waiter_gives_up_after_queue_timeout():
+    scheduler = LlmScheduler(max_in_flight=1, max_queue=5, queue_timeout=0.05)
+
+    async def scenario():
+        await scheduler.acquire()
+        with pytest.raises(SchedulerOverloaded):
+            await scheduler.acquire()
+        assert scheduler.queue_depth == 0
+        # The abandoned waiter must not be handed the slot
+        scheduler.release()
+
+    asyncio.run(scenario())
+    assert scheduler.timed_out == 1
+    assert scheduler.in_flight == 0
+
+
+def test_cancelled_waiter_passes_a_handed_over_slot_on():
+    scheduler = LlmScheduler(max_in_flight=1, max_queue=5)
+
+    async def scenario():
+        await scheduler.acquire()
+        first = asyncio.create_task(scheduler.acquire())
+        await _settle()
+        second = asyncio.create_task(scheduler.acquire())
+        await _settle()
+        # Hand the slot to the first waiter, then cancel it before it resumes
+        scheduler.release()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.wait_for(second, 1)
+        assert scheduler.in_flight == 1
+        assert scheduler.queue_depth == 0
+        scheduler.release()
+
+    asyncio.run(scenario())
+    assert scheduler.in_flight == 0
@@ -0,0 +1,37 @@
+"""
+A worker process that dies is replaced and the call that hit it is retried
+"""
+
+import asyncio
+import os
+
+from app.services.nlp_executor import AnalysisExecutor
+
+
+class CrashOnce:
+    """Kills its worker process the first time it sees a given marker path"""
+
+    def pid(self, marker: str) -> int:
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            os._exit(1)
+        return os.getpid()
+
+
+def test_broken_pool_is_rebuilt_and_the_call_retried(tmp_path):
+    executor = AnalysisExecutor(CrashOnce, workers=1, max_pending=4)
+
+    async def scenario():
+        await executor.start()
+        first_pool = executor._pool
+        pid = await executor.run("pid", str(tmp_path / "crashed"))
+        return first_pool, pid
+
+    try:
+        first_pool, pid = asyncio.run(scenario())
+        assert pid != os.getpid()
+        assert executor._pool is not first_pool
+        assert executor.stats()["broken"] is False
+        assert executor.stats()["restarts"] == 1
+    finally:
+        executor.shutdown()
@@ -0,0 +1,73 @@
+"""
+Prefix-reuse variants must reach the model as the same text as a full prompt
+"""
+
+import asyncio
+
+import httpx
+
+from app.services.ollama_service import OllamaAiService
+from loadtest.fake_ollama import FakeOllamaConfig, create_app
+
+JOB_INFO = {
+    "company_name": "Acme",
+    "position_title": "Backend Engineer",
+    "job_posting_text": "Python and Docker",
+    "cv_text": "Python developer",
+}
+SKILL_MATCHES = [{"skill": "python", "matched": True}]
+
+
+def make_service(fake):
+    service = OllamaAiService()
+    service._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://ollama")
+    return service
+
+
+def test_branched_variant_sees_the_full_templated_prompt():
+    config = FakeOllamaConfig(latency=0.0, tokens_per_second=0.0, tokens=20)
+    fake = create_app(config)
+    service = make_service(fake)
+
+    async def run():
+        full = await service.draft_cover_letter_result(JOB_INFO, [], SKILL_MATCHES, "formal")
+        primed = await service.prime_cover_letter_prefix(JOB_INFO, SKILL_MATCHES)
+        branched = await service.draft_cover_letter_result(
+            JOB_INFO, [], SKILL_MATCHES, "formal", prefix_context=primed.context
+        )
+        await service.aclose()
+        return full, primed, branched
+
+    full, primed, branched = asyncio.run(run())
+    full_input, prime_input, branched_input = fake.state.prompts
+
+    # Priming samples one token and the context is cut back to the prompt alone
+    assert primed.eval_count == 1
+    assert fake.state.decode(primed.context) == prime_input
+    assert branched_input == full_input
+    assert branched.eval_count == full.eval_count == 20
+
+
+def test_branched_letters_are_cached_apart_from_full_prompt_letters():
+    fake = create_app(FakeOllamaConfig(latency=0.0, tokens_per_second=0.0, tokens=5))
+    service = make_service(fake)
+    prefix, suffix, _ = service._build_cover_letter_prompt_parts(JOB_INFO, SKILL_MATCHES, "formal")
+
+    async def run():
+        primed = await service.prime_cover_letter_prefix(JOB_INFO, SKILL_MATCHES)
+        await service.draft_cover_letter_result(JOB_INFO, [], SKILL_MATCHES, "formal", prefix_context=primed.context)
+        await service.aclose()
+
+    async def lookups():
+        return (
+            await service.cached_result(prefix + suffix, temperature=0.6, max_tokens=700),
+            await service.cached_result(prefix + suffix, temperature=0.6, max_tokens=700, raw=True),
+            await service.cached_cover_letter(JOB_INFO, SKILL_MATCHES, "formal"),
+        )
+
+    asyncio.run(run())
+    full, branched, either = asyncio.run(lookups())
+    assert full is None
+    assert branched is not None
+    # reuse_cached lookups accept a letter from either path
+    assert either.cached